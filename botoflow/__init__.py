@@ -14,7 +14,8 @@
 from .core import coroutine, Return, return_, Future
 from .context import get_context, set_context
 from .workers import (GenericWorkflowWorker, WorkflowWorker, ActivityWorker, ThreadedWorkflowExecutor,
-                      ThreadedActivityExecutor, MultiprocessingWorkflowExecutor, MultiprocessingActivityExecutor)
+                      ThreadedActivityExecutor, MultiprocessingWorkflowExecutor, MultiprocessingActivityExecutor,
+                      ProcessPoolActivityExecutor)
 from .decorators import workflow, execute, activity, manual_activity, activities, signal, retry_activity
 from .activity_retrying import retry_on_exception
 from .options import workflow_options, activity_options
@@ -0,0 +1,70 @@
+# Copyright 2013 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://aws.amazon.com/apache2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+"""
+Index of the activity methods of the activities classes, so the activity
+workers find them without scanning every attribute of the activities
+objects.
+
+The :py:func:`~botoflow.decorators.activities` decorator fills the index when
+the class is created, the classes that are not decorated with it (like the
+subclasses of decorated classes) are scanned once and cached.
+"""
+
+import types
+import weakref
+
+__all__ = ('register_activities', 'activity_names')
+
+#: class attribute holding the names of the activity methods of the class
+INDEX_ATTR = '__botoflow_activities__'
+
+_scanned_classes = weakref.WeakKeyDictionary()
+
+
+def _is_activity(func):
+    return (isinstance(func, types.FunctionType) and
+            'activity_type' in getattr(func, 'swf_options', ()))
+
+
+def _scan(cls):
+    names = []
+    for name in dir(cls):
+        try:
+            func = getattr(cls, name)
+        except AttributeError:
+            continue
+
+        if _is_activity(func):
+            names.append(name)
+    return tuple(names)
+
+
+def register_activities(cls, names):
+    """Records *names* as the names of the activity methods of *cls*"""
+    setattr(cls, INDEX_ATTR, tuple(names))
+
+
+def activity_names(cls):
+    """Returns the names of the activity methods of *cls*
+
+    :param type cls: activities class
+    :rtype: tuple
+    """
+    # only the index of the class itself is valid, the subclasses may add
+    # activities
+    names = cls.__dict__.get(INDEX_ATTR)
+    if names is None:
+        names = _scanned_classes.get(cls)
+        if names is None:
+            names = _scanned_classes[cls] = _scan(cls)
+    return names
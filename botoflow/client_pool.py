@@ -0,0 +1,118 @@
+# Copyright 2013 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://aws.amazon.com/apache2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+"""
+Pool of the botocore SWF clients shared by the workers and workflow starters
+of a process.
+
+botocore clients are thread-safe, so there's no need for more than one client
+per session and region. Each client keeps its own pool of HTTP connections
+though, which should be large enough for all the threads using it at the
+same time (the long polls especially), or they'd wait for each other or
+reconnect all the time.
+"""
+
+import os
+import threading
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class _PooledClient(object):
+
+    __slots__ = ('session', 'client', 'max_pool_connections')
+
+    def __init__(self, session, client, max_pool_connections):
+        self.session = session
+        self.client = client
+        self.max_pool_connections = max_pool_connections
+
+
+class ClientPool(object):
+    """Hands out SWF clients, one per botocore session, region and process
+    (the clients can't be shared with the forked processes).
+
+    A client is reused as long as its connection pool is at least as large
+    as requested, otherwise a larger one is created and replaces it in the
+    pool.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients = dict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_client(self, session, region_name, max_pool_connections=None):
+        """Returns a SWF client for *session* and *region_name*
+
+        :param session: botocore session
+        :type session: botocore.session.Session
+        :param str region_name: AWS region
+        :param int max_pool_connections: Minimum size of the connection pool
+            of the client, botocore's default (10) if None.
+        :rtype: botocore.client.SWF
+        """
+        # the session is kept in the pool, so its id can't be reused
+        key = (id(session), region_name, os.getpid())
+        with self._lock:
+            pooled = self._clients.get(key)
+            if pooled is not None and pooled.session is session and (
+                    max_pool_connections is None or
+                    max_pool_connections <= (pooled.max_pool_connections or 0)):
+                self.hits += 1
+                return pooled.client
+
+            self.misses += 1
+            if pooled is not None and pooled.max_pool_connections is not None:
+                max_pool_connections = max(max_pool_connections, pooled.max_pool_connections)
+
+            log.debug("Creating a SWF client for %s with %s connections", region_name,
+                      max_pool_connections or "default")
+            client = self._create_client(session, region_name, max_pool_connections)
+            self._clients[key] = _PooledClient(session, client, max_pool_connections)
+            return client
+
+    @staticmethod
+    def _create_client(session, region_name, max_pool_connections):
+        kwargs = {}
+        if max_pool_connections is not None:
+            # import here, as it's not available in the oldest botocore versions
+            from botocore.config import Config
+            kwargs['config'] = Config(max_pool_connections=max_pool_connections)
+        return session.create_client(service_name='swf', region_name=region_name, **kwargs)
+
+    def clear(self):
+        """Forgets all the pooled clients"""
+        with self._lock:
+            self._clients.clear()
+
+    def stats(self):
+        """Returns a dict of the count of the pooled *clients* and of the pool
+        *hits* and *misses*
+        """
+        with self._lock:
+            return {'clients': len(self._clients),
+                    'hits': self.hits,
+                    'misses': self.misses}
+
+
+#: The pool used by the workers and workflow starters
+client_pool = ClientPool()
+
+
+def get_client(session, region_name, max_pool_connections=None):
+    """Returns a SWF client from the :py:data:`client_pool`, see
+    :py:meth:`ClientPool.get_client`
+    """
+    return client_pool.get_client(session, region_name, max_pool_connections)
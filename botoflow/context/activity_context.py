@@ -40,14 +40,24 @@ class ActivityContext(ContextBase):
 
         Ignore request by catching the exception, or let it raise to cancel.
 
+        With :py:attr:`~botoflow.workers.activity_worker.ActivityWorker.background_heartbeats`
+        on, this only schedules the heartbeat and does not block.
+
         :param details: If specified, contains details about the progress of the task.
         :type details: str
         :raises CancellationError: if uncaught, will record this activity as cancelled
             in SWF history, and bubble up to the decider, where it will cancel the
             workflow.
         """
-        result = self.worker.request_heartbeat(self.task, details)
-        if result['cancelRequested']:
+        heartbeat_manager = self.worker.heartbeat_manager
+        if heartbeat_manager is not None:
+            _, activity_type = self.worker.get_activity(self.task)
+            cancel_requested = heartbeat_manager.heartbeat(
+                self.task, details, activity_type.heartbeat_timeout)
+        else:
+            cancel_requested = self.worker.request_heartbeat(self.task, details)['cancelRequested']
+
+        if cancel_requested:
             raise CancellationError('Cancel was requested during activity heartbeat')
 
     @property
@@ -14,6 +14,11 @@
 import threading
 import logging
 
+try:  # Python 3.7+
+    import contextvars
+except ImportError:
+    contextvars = None
+
 log = logging.getLogger(__name__)
 
 DEBUG = False
@@ -23,10 +28,22 @@ class ContextBase(object):
 
     thread_local = threading.local()
 
+    # where available, the context is kept in a context variable instead, so
+    # that activities running concurrently as asyncio tasks in the same
+    # thread each get their own (see AsyncActivityExecutor)
+    if contextvars is not None:
+        context_var = contextvars.ContextVar('flow_current_context')
+
     # Python has no good support for class properties
     @classmethod
     def get_context(cls):
-        context = cls.thread_local.flow_current_context
+        if contextvars is not None:
+            try:
+                context = cls.context_var.get()
+            except LookupError:
+                raise AttributeError("No flow context is set")
+        else:
+            context = cls.thread_local.flow_current_context
         if DEBUG:
             log.debug("Current context: %s", context)
         return context
@@ -35,4 +52,7 @@ class ContextBase(object):
     def set_context(cls, context):
         if DEBUG:
             log.debug("Setting context: %s", context)
-        cls.thread_local.flow_current_context = context
+        if contextvars is not None:
+            cls.context_var.set(context)
+        else:
+            cls.thread_local.flow_current_context = context
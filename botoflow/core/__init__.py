@@ -15,5 +15,7 @@ from .decorators import coroutine, daemon_coroutine, task, daemon_task
 from .async_event_loop import AsyncEventLoop
 from .async_context import get_async_context
 from .base_future import BaseFuture, Return, return_
-from .future import Future, AnyFuture, AllFuture
+from .future import (Future, AnyFuture, AllFuture, as_completed, wait, FIRST_COMPLETED, FIRST_EXCEPTION,
+                     ALL_COMPLETED)
+from .bounded_future import gather_bounded, as_completed_bounded
 from .exceptions import CancelledError
@@ -18,22 +18,63 @@ from collections import deque
 
 from .async_root_task_context import AsyncRootTaskContext
 from .async_context import set_async_context
+from .async_task_priority import PRIORITY_HANDLER, PRIORITY_CONTINUATION, PRIORITY_NEW
 
 log = logging.getLogger(__name__)
 
 # change this to enable a ton of debug printing
 DEBUG = False
 
+# how many tasks can run in a row in priority mode while a lower priority task
+# is waiting, before the lower priority task gets to run
+DEFAULT_FAIRNESS_QUANTUM = 64
+
 
 class AsyncEventLoop(object):
     """
-    TODO Document
+    Runs the scheduled tasks (:py:class:`~botoflow.core.async_task.AsyncTask`).
+
+    By default the tasks run in FIFO order, with :py:meth:`execute_now`
+    putting the task in front of the queue.
+
+    With *priority_scheduling* enabled, every task is queued according to its
+    ``priority`` class: except/finally handlers (which also deliver
+    cancellations) run first, then the continuations of the coroutines waiting
+    on futures and the new coroutines and tasks run last. To keep the lower
+    classes from starving, a waiting task runs at the latest after
+    *fairness_quantum* tasks of higher priority.
+
+    .. note::
+
+        The order of the tasks determines the order of the decisions, so the
+        scheduling mode must not change while there are open workflow
+        executions that were started with a different mode.
+
+    :param bool priority_scheduling: Enables the priority scheduling mode.
+    :param int fairness_quantum: Maximum count of higher priority tasks that
+        run while a lower priority task is waiting.
     """
 
-    def __init__(self):
+    def __init__(self, priority_scheduling=False, fairness_quantum=DEFAULT_FAIRNESS_QUANTUM):
         self.tasks = deque()
         self.root_context = AsyncRootTaskContext(weakref.proxy(self))
 
+        self.priority_scheduling = priority_scheduling
+        self.fairness_quantum = fairness_quantum
+        # one queue per priority class and the count of tasks that ran while
+        # the queue was waiting
+        self._priority_tasks = tuple(deque() for _ in (PRIORITY_HANDLER, PRIORITY_CONTINUATION, PRIORITY_NEW))
+        self._skipped = [0] * len(self._priority_tasks)
+
+        # counters for profiling
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.tasks_queued = 0
+        self.tasks_run = 0
+
+        # set to an AsyncProfiler to profile the tasks and coroutines
+        self.profiler = None
+
     def __enter__(self):
         set_async_context(self.root_context)
         return self.root_context
@@ -42,29 +83,91 @@ class AsyncEventLoop(object):
     def __exit__(self, exc_type, err, tb):
         set_async_context(None)
 
+    def _queue_for(self, task):
+        if self.priority_scheduling:
+            return self._priority_tasks[task.priority]
+        return self.tasks
+
+    def _task_queued(self):
+        self.tasks_queued += 1
+        self.queue_depth += 1
+        if self.queue_depth > self.max_queue_depth:
+            self.max_queue_depth = self.queue_depth
+
     def execute(self, task):
         if DEBUG:
             log.debug("Adding task: %s", task)
-        self.tasks.append(task)
+        self._queue_for(task).append(task)
+        self._task_queued()
 
     def execute_now(self, task):
         if DEBUG:
             log.debug("Prepending task: %s", task)
-        self.tasks.appendleft(task)
+        self._queue_for(task).appendleft(task)
+        self._task_queued()
 
     def execute_all_tasks(self):
         while self.execute_queued_task():
             pass
 
+    def _pop_priority_task(self):
+        queues = self._priority_tasks
+        skipped = self._skipped
+
+        chosen = None
+        # the lowest priority queue that waited long enough goes first
+        for priority in range(len(queues) - 1, 0, -1):
+            if queues[priority] and skipped[priority] >= self.fairness_quantum:
+                chosen = priority
+                break
+
+        if chosen is None:
+            for priority, queue in enumerate(queues):
+                if queue:
+                    chosen = priority
+                    break
+            else:
+                raise IndexError("pop from an empty queue")
+
+        for priority, queue in enumerate(queues):
+            if priority == chosen:
+                skipped[priority] = 0
+            elif queue:
+                skipped[priority] += 1
+
+        return queues[chosen].popleft()
+
     def execute_queued_task(self):
         if DEBUG:
-            log.debug("Task queue: %s", self.tasks)
+            log.debug("Task queue: %s", self._priority_tasks if self.priority_scheduling else self.tasks)
         try:
-            task = self.tasks.popleft()
+            if self.priority_scheduling:
+                task = self._pop_priority_task()
+            else:
+                task = self.tasks.popleft()
+            self.queue_depth -= 1
             if not task.done:
                 if DEBUG:
                     log.debug("Running task: %s", task)
-                task.run()
+                self.tasks_run += 1
+                if self.profiler is None:
+                    task.run()
+                else:
+                    started = self.profiler.start()
+                    task.run()
+                    self.profiler.task_done(task, started)
         except IndexError:  # no more tasks
             return False
         return True
+
+    def stats(self):
+        """Returns the event loop counters
+
+        :returns: dict with *queue_depth*, *max_queue_depth*, *tasks_queued*
+            and *tasks_run* counts
+        :rtype: dict
+        """
+        return {'queue_depth': self.queue_depth,
+                'max_queue_depth': self.max_queue_depth,
+                'tasks_queued': self.tasks_queued,
+                'tasks_run': self.tasks_run}
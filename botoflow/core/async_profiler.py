@@ -0,0 +1,169 @@
+# Copyright 2013 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://aws.amazon.com/apache2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+"""
+Profiler for the :py:class:`~botoflow.core.async_event_loop.AsyncEventLoop`.
+
+Attributes the wall and CPU time, as well as the count of runs/resumes, to
+every task and every coroutine (by the name of the ``@coroutine`` decorated
+function) run by the event loop. The result can be printed as a report or
+saved in the collapsed stack format understood by the flamegraph tools.
+"""
+
+import time
+import timeit
+
+import six
+
+# wall clock time
+_wall_clock = timeit.default_timer
+# CPU time of the process, time.clock is the best we can do on Python 2
+_cpu_clock = getattr(time, 'process_time', None) or time.clock
+
+
+class ProfileEntry(object):
+    """Counters of a single profiled task or coroutine"""
+
+    __slots__ = ('count', 'wall_time', 'cpu_time')
+
+    def __init__(self):
+        self.count = 0
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+
+    def __repr__(self):
+        return "<%s count=%d wall_time=%f cpu_time=%f>" % (
+            self.__class__.__name__, self.count, self.wall_time, self.cpu_time)
+
+
+def _task_name(task):
+    # task names are sometimes the functions themselves
+    name = task.name
+    if name is None:
+        name = task.function
+    if isinstance(name, six.string_types):
+        return name
+    return getattr(name, '__name__', repr(name))
+
+
+def _context_stack(context):
+    names = list()
+    while context is not None:
+        name = getattr(context, 'name', None)
+        if name is not None:
+            names.append(name)
+        context = context.parent
+    names.reverse()
+    return ';'.join(names)
+
+
+class AsyncProfiler(object):
+    """
+    Collects the timings of the tasks and coroutines. Set an instance as the
+    ``profiler`` attribute of the event loop to enable profiling::
+
+        ev = AsyncEventLoop()
+        ev.profiler = AsyncProfiler()
+        ...
+        ev.execute_all_tasks()
+        print(ev.profiler.report())
+
+    The time of a coroutine is the time spent in its code between two
+    ``yield`` statements, so it does not include the coroutines or tasks it
+    started. The time of a task includes everything it ran.
+    """
+
+    def __init__(self):
+        self.tasks = dict()
+        self.coroutines = dict()
+        self.stacks = dict()
+
+    def reset(self):
+        """Forgets all collected timings"""
+        self.tasks.clear()
+        self.coroutines.clear()
+        self.stacks.clear()
+
+    @staticmethod
+    def start():
+        """Returns the start timestamps to pass to one of the ``*_done``
+        methods
+        """
+        return _wall_clock(), _cpu_clock()
+
+    @staticmethod
+    def _add(entries, name, started):
+        wall_time = _wall_clock() - started[0]
+        cpu_time = _cpu_clock() - started[1]
+
+        entry = entries.get(name)
+        if entry is None:
+            entry = entries[name] = ProfileEntry()
+        entry.count += 1
+        entry.wall_time += wall_time
+        entry.cpu_time += cpu_time
+        return wall_time
+
+    def task_done(self, task, started):
+        """Records a run of *task* started at *started*
+
+        :type task: botoflow.core.async_task.AsyncTask
+        :param tuple started: the value returned from :py:meth:`start`
+        """
+        self._add(self.tasks, _task_name(task), started)
+
+    def coroutine_done(self, context, started):
+        """Records a resume of the coroutine running in *context*, started at
+        *started*
+
+        :type context: botoflow.core.async_task_context.AsyncTaskContext
+        :param tuple started: the value returned from :py:meth:`start`
+        """
+        wall_time = self._add(self.coroutines, context.name, started)
+
+        stack = _context_stack(context)
+        self.stacks[stack] = self.stacks.get(stack, 0.0) + wall_time
+
+    @staticmethod
+    def _format_entries(title, entries, limit):
+        lines = [title,
+                 "%10s %12s %12s  %s" % ("count", "wall (s)", "cpu (s)", "name")]
+        items = sorted(six.iteritems(entries),
+                       key=lambda item: (-item[1].cpu_time, -item[1].wall_time, item[0]))
+        for name, entry in items[:limit]:
+            lines.append("%10d %12.6f %12.6f  %s" % (entry.count, entry.wall_time,
+                                                     entry.cpu_time, name))
+        return lines
+
+    def report(self, limit=None):
+        """Returns the collected timings as a human readable report, sorted by
+        the CPU time
+
+        :param int limit: Show only the *limit* most expensive entries of
+            each section.
+        :rtype: str
+        """
+        lines = self._format_entries("Coroutines:", self.coroutines, limit)
+        lines.append("")
+        lines.extend(self._format_entries("Tasks:", self.tasks, limit))
+        return "\n".join(lines)
+
+    def dump_collapsed(self, fileobj):
+        """Writes the coroutine stacks in the collapsed stack format (one
+        ``name;name;name count`` line per stack, the count being the wall
+        time in microseconds), which can be turned into a flamegraph.
+
+        :param fileobj: file-like object open for writing text
+        """
+        for stack in sorted(self.stacks):
+            microseconds = int(round(self.stacks[stack] * 1000000))
+            fileobj.write("%s %d\n" % (stack, max(microseconds, 1)))
@@ -12,15 +12,15 @@
 # permissions and limitations under the License.
 
 import sys
-import traceback
 import logging
 
 import six
 
 from .async_context import get_async_context, set_async_context
 from .async_task_context import AsyncTaskContext
+from .async_task_priority import PRIORITY_NEW
 from .exceptions import CancellationError
-from .utils import extract_stacks_from_contexts, filter_framework_frames
+from .utils import extract_stacks_from_contexts, LazyTracebackList
 
 log = logging.getLogger(__name__)
 
@@ -54,6 +54,7 @@ class AsyncTask(object):
             kwargs = {}
 
         self.cancellable = True
+        self.priority = PRIORITY_NEW
         self.cancelled = False
         self.exception = None
         self.done = False
@@ -94,16 +95,10 @@ class AsyncTask(object):
             except Exception as err:
                 self.exception = err
                 _, _, tb = sys.exc_info()
-                stacks = extract_stacks_from_contexts(self.context)
-                tb_list = list()
-
-                for stack in stacks:
-                    tb_list.extend(stack)
-                    tb_list.append((None, 1, 'flow.core',
-                                    '---continuation---'))
-
-                tb_list.extend(
-                    filter_framework_frames(traceback.extract_tb(tb)))
+                # the contexts are unlinked from their parents as they
+                # finish, so the stacks have to be collected now
+                tb_list = LazyTracebackList(
+                    extract_stacks_from_contexts(self.context), tb)
 
                 self.context.handle_exception(err, tb_list)
             finally:
@@ -17,6 +17,7 @@ import logging
 from weakref import WeakSet
 
 from .async_context import get_async_context, set_async_context
+from .async_task_priority import PRIORITY_HANDLER
 from .exceptions import CancellationError
 
 from .utils import split_stack, log_task_context
@@ -173,6 +174,7 @@ class AsyncTaskContext(AbstractAsyncTaskContext):
                 task = AsyncTask(except_func, (err,), context=self,
                                  name=except_func.__name__)
                 task.cancellable = False
+                task.priority = PRIORITY_HANDLER
                 task.daemon = self.daemon
                 # execute exceptions asap to have a chance to cancel any
                 # pending tasks
@@ -194,6 +196,7 @@ class AsyncTaskContext(AbstractAsyncTaskContext):
                                  name=self.finally_func.__name__)
                 task.daemon = self.daemon
                 task.cancellable = False
+                task.priority = PRIORITY_HANDLER
                 task.execute()
                 self.finally_func = None
         else:
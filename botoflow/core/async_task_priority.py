@@ -0,0 +1,20 @@
+# Copyright 2013 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://aws.amazon.com/apache2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+"""
+AsyncTask priority classes, used by the AsyncEventLoop in the priority
+scheduling mode. Lower value runs first.
+"""
+
+PRIORITY_HANDLER = 0  # except/finally handlers, which also deliver cancellations
+PRIORITY_CONTINUATION = 1  # future callbacks and coroutines resuming on a future
+PRIORITY_NEW = 2  # new coroutines and tasks
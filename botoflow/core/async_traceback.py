@@ -83,8 +83,9 @@ def extract_tb(limit=None):
     if context is not None:
         tb_list = context.tb_list
         if tb_list is not None:
+            # slicing also turns a lazy traceback into a plain list
             if limit is not None:
                 return tb_list[-limit:]
-            return tb_list
+            return tb_list[:]
     else:
         return traceback.extract_tb(prev_tb)
@@ -0,0 +1,209 @@
+# Copyright 2013 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://aws.amazon.com/apache2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+"""
+Bounded fan-out over a (possibly very large) number of activities or child
+workflows. Only a limited number of the futures is kept open at any time, new
+ones are started as the open ones complete.
+
+Because new work is only ever started from the completion callbacks of the
+open futures, the order in which work is started depends on nothing but the
+order of the events in the workflow history, which keeps the fan-out
+deterministic during replay.
+"""
+
+import logging
+
+import six
+
+from .async_task import AsyncTask
+from .async_task_priority import PRIORITY_CONTINUATION
+from .base_future import BaseFuture
+from .future import AsCompletedIterator, _future_exception
+
+log = logging.getLogger(__name__)
+
+# change this to enable a ton of debug printing
+DEBUG = False
+
+_EXHAUSTED = object()
+
+
+class _BoundedFanOut(object):
+    """
+    Calls the *callables* one by one, keeping at most *max_in_flight* of the
+    futures they return open at the same time.
+    """
+
+    def __init__(self, callables, max_in_flight):
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be greater than 0")
+
+        self._callables = iter(callables)
+        self._max_in_flight = max_in_flight
+        self._in_flight = 0
+        self._scheduled = 0
+        self._stopped = False
+
+        # we always look one callable ahead, so we know if there's more to come
+        self._next_callable = next(self._callables, _EXHAUSTED)
+
+    @property
+    def exhausted(self):
+        """True if there are no more callables left to call"""
+        return self._stopped or self._next_callable is _EXHAUSTED
+
+    @property
+    def in_flight(self):
+        """Count of futures that are currently open"""
+        return self._in_flight
+
+    def _schedule(self):
+        while self._in_flight < self._max_in_flight and not self.exhausted:
+            func = self._next_callable
+            self._next_callable = next(self._callables, _EXHAUSTED)
+
+            index = self._scheduled
+            self._scheduled += 1
+            self._in_flight += 1
+
+            if DEBUG:
+                log.debug("Starting bounded fan-out item %d: %r", index, func)
+
+            future = func()
+            if not isinstance(future, BaseFuture):
+                future = BaseFuture.with_result(future)
+
+            self._watch_future(index, future)
+
+    def _watch_future(self, index, future):
+        task = AsyncTask(self._future_callback, (index, future),
+                         name=self._future_callback.__name__)
+        task.cancellable = False
+        task.priority = PRIORITY_CONTINUATION
+        future.add_task(task)
+
+    def _future_callback(self, index, future):
+        self._in_flight -= 1
+        self._future_done(index, future)
+        self._schedule()
+
+    def _future_done(self, index, future):
+        raise NotImplementedError()
+
+
+class BoundedAllFuture(_BoundedFanOut, BaseFuture):
+    """
+    Future that resolves to a tuple of results of all the futures returned by
+    *callables* (in the same order as the *callables*), while having at most
+    *max_in_flight* of them open at a time.
+
+    If any of the futures fails, no more *callables* are called and the
+    exception is set on this future.
+    """
+
+    def __init__(self, callables, max_in_flight):
+        BaseFuture.__init__(self)
+        _BoundedFanOut.__init__(self, callables, max_in_flight)
+
+        self._results = dict()
+        self._schedule()
+
+        if self.exhausted and not self._in_flight:
+            self.set_result(tuple())
+
+    def _future_done(self, index, future):
+        if self.done():
+            return
+
+        exception, traceback = _future_exception(future)
+        if exception is not None:
+            self._stopped = True
+            self.set_exception(exception, traceback)
+            return
+
+        self._results[index] = future.result()
+        if self.exhausted and not self._in_flight:
+            self.set_result(tuple(self._results[i] for i in six.moves.range(self._scheduled)))
+
+
+class BoundedAsCompleted(_BoundedFanOut, AsCompletedIterator):
+    """
+    Iterator over futures returned by *callables*, in the order they complete,
+    while having at most *max_in_flight* of them open at a time.
+
+    See :py:class:`~botoflow.core.future.AsCompletedIterator` for details.
+    """
+
+    def __init__(self, callables, max_in_flight):
+        AsCompletedIterator.__init__(self)
+        _BoundedFanOut.__init__(self, callables, max_in_flight)
+        self._schedule()
+
+    def _watch_future(self, index, future):
+        self.add_future(future)
+
+    def _has_more(self):
+        return AsCompletedIterator._has_more(self) or not self.exhausted
+
+    def _future_callback(self, future):
+        self._in_flight -= 1
+        AsCompletedIterator._future_callback(self, future)
+        self._schedule()
+
+
+def gather_bounded(callables, max_in_flight):
+    """
+    Call every one of *callables* (usually activities or child workflows
+    wrapped in a :py:func:`functools.partial` or a lambda) and gather their
+    results, keeping at most *max_in_flight* of them open at any time.
+
+    This keeps both the decision size and the number of open activities
+    bounded, no matter how many *callables* there are. *callables* may be a
+    generator, it will only be consumed as the open futures complete.
+
+    .. code-block:: python
+
+        @execute(version='1.0', execution_start_to_close_timeout=1*HOURS)
+        def process_all(self, items):
+            results = yield gather_bounded(
+                (functools.partial(MyActivities.process, item) for item in items),
+                max_in_flight=100)
+
+    :param callables: iterable of callables returning futures.
+    :param int max_in_flight: Maximum count of futures open at the same time.
+    :returns: future of a tuple of the results in the order of *callables*
+    :rtype: BoundedAllFuture
+    """
+    return BoundedAllFuture(callables, max_in_flight)
+
+
+def as_completed_bounded(callables, max_in_flight):
+    """
+    The streaming variant of :py:func:`gather_bounded`. Returns an iterator of
+    futures that complete in the order the underlying futures complete, so the
+    results can be processed as soon as they arrive.
+
+    .. code-block:: python
+
+        @execute(version='1.0', execution_start_to_close_timeout=1*HOURS)
+        def process_all(self, items):
+            calls = (functools.partial(MyActivities.process, item) for item in items)
+            for future in as_completed_bounded(calls, max_in_flight=100):
+                result = yield future
+                yield MyActivities.store(result)
+
+    :param callables: iterable of callables returning futures.
+    :param int max_in_flight: Maximum count of futures open at the same time.
+    :rtype: BoundedAsCompleted
+    """
+    return BoundedAsCompleted(callables, max_in_flight)
@@ -15,10 +15,13 @@ import sys
 import threading
 import logging
 
+from collections import deque, namedtuple
 from weakref import WeakSet
 
 from .async_task import AsyncTask
+from .async_task_priority import PRIORITY_CONTINUATION, PRIORITY_HANDLER
 from .base_future import BaseFuture, Return
+from .exceptions import CancelledError
 
 try:  # PY3k
     import collections.abc
@@ -34,6 +37,13 @@ log = logging.getLogger(__name__)
 # change this to enable a ton of debug printing
 DEBUG = False
 
+# wait() return_when values, same as in concurrent.futures
+FIRST_COMPLETED = 'FIRST_COMPLETED'
+FIRST_EXCEPTION = 'FIRST_EXCEPTION'
+ALL_COMPLETED = 'ALL_COMPLETED'
+
+DoneAndNotDoneFutures = namedtuple('DoneAndNotDoneFutures', 'done not_done')
+
 
 class Future(BaseFuture):
 
@@ -107,21 +117,41 @@ class Future(BaseFuture):
                         "&: '%s' and '%s'" % (self.__class__.__name__,
                                               other.__class__.__name__))
 
+    def _resume_coroutine(self, coroutine, value, exception, traceback):
+        if exception is not None:
+            return coroutine.throw(exception.__class__, exception, traceback)
+        return coroutine.send(value)
+
+    def _profile_coroutine(self, profiler, coroutine, value, exception,
+                           traceback):
+        context = self.context
+        started = profiler.start()
+        try:
+            return self._resume_coroutine(coroutine, value, exception,
+                                          traceback)
+        finally:
+            profiler.coroutine_done(context, started)
+
     def _progress_coroutine(self, coroutine, value=None, exception=None,
                             traceback=None):
         if DEBUG:
             log.debug('Future._progress_coroutine: %s, %s, %s, %s',
                       coroutine, value, exception, traceback)
 
+        profiler = None
+        if self.context is not None:
+            profiler = self.context.eventloop.profiler
+
         self.track_coroutine(coroutine)
         try:
             with self.context:
-                if exception is not None:
-                    covalue = coroutine.throw(exception.__class__, exception,
-                                              traceback)
-
+                if profiler is None:
+                    covalue = self._resume_coroutine(coroutine, value,
+                                                     exception, traceback)
                 else:
-                    covalue = coroutine.send(value)
+                    covalue = self._profile_coroutine(profiler, coroutine,
+                                                      value, exception,
+                                                      traceback)
 
         except Return as err:
             self.set_result(err.value)
@@ -152,6 +182,7 @@ class Future(BaseFuture):
                                      (covalue, coroutine),
                                      name=self._on_future_completion)
                     task.cancellable = False
+                    task.priority = PRIORITY_CONTINUATION
                     covalue.add_task(task)
                     return
                 elif isinstance(covalue, Iterable):
@@ -160,6 +191,7 @@ class Future(BaseFuture):
                                      (all_future, coroutine),
                                      name=self._on_future_completion)
                     task.cancellable = False
+                    task.priority = PRIORITY_CONTINUATION
                     all_future.add_task(task)
                     return
 
@@ -193,6 +225,7 @@ class Future(BaseFuture):
         with self.context:
             task = AsyncTask(self._progress_coroutine,
                              (coroutine, None, err, None))
+            task.priority = PRIORITY_HANDLER
             task.execute()
         self.context = None
 
@@ -215,6 +248,7 @@ class AnyFuture(BaseFuture):
         task = AsyncTask(self._future_callback, (future,),
                          name=self._future_callback.__name__)
         task.cancellable = False
+        task.priority = PRIORITY_CONTINUATION
         future.add_task(task)
 
     def _future_callback(self, future):
@@ -252,3 +286,166 @@ class AllFuture(AnyFuture):
             else:
                 return
         self.set_result(tuple(results))
+
+
+def _future_exception(future):
+    """
+    Returns a tuple of exception and traceback of a finished future, treating
+    cancellation as a CancelledError exception
+    """
+    try:
+        return future.exception(), future.traceback()
+    except CancelledError as err:
+        return err, None
+
+
+class AsCompletedIterator(object):
+    """
+    Iterator over futures in the order they complete.
+
+    Every item is a future, which is either already done, or will be done with
+    the result (or exception) of the next future to complete.
+    """
+
+    def __init__(self, futures=tuple()):
+        self._done = deque()
+        self._waiters = deque()
+        self._outstanding = 0
+
+        for future in futures:
+            self.add_future(future)
+
+    def add_future(self, future):
+        self._outstanding += 1
+        task = AsyncTask(self._future_callback, (future,),
+                         name=self._future_callback.__name__)
+        task.cancellable = False
+        task.priority = PRIORITY_CONTINUATION
+        future.add_task(task)
+
+    def _has_more(self):
+        return self._outstanding > len(self._waiters)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._done:
+            return self._done.popleft()
+
+        if self._has_more():
+            waiter = BaseFuture()
+            self._waiters.append(waiter)
+            return waiter
+
+        raise StopIteration()
+
+    next = __next__  # Python 2
+
+    def _future_callback(self, future):
+        self._outstanding -= 1
+
+        if not self._waiters:
+            self._done.append(future)
+            return
+
+        waiter = self._waiters.popleft()
+        exception, traceback = _future_exception(future)
+        if exception is not None:
+            waiter.set_exception(exception, traceback)
+        else:
+            waiter.set_result(future.result())
+
+
+class WaitFuture(BaseFuture):
+    """
+    Future that resolves to a :py:data:`DoneAndNotDoneFutures` named tuple as
+    soon as the *return_when* condition is met.
+    """
+
+    def __init__(self, futures, return_when=ALL_COMPLETED):
+        super(WaitFuture, self).__init__()
+
+        if return_when not in (FIRST_COMPLETED, FIRST_EXCEPTION, ALL_COMPLETED):
+            raise ValueError("Invalid return_when value: %r" % (return_when,))
+
+        self._futures = tuple(futures)
+        self._return_when = return_when
+        self._done = list()
+
+        for future in self._futures:
+            task = AsyncTask(self._future_callback, (future,),
+                             name=self._future_callback.__name__)
+            task.cancellable = False
+            task.priority = PRIORITY_CONTINUATION
+            future.add_task(task)
+
+        if not self._futures:
+            self.set_result(DoneAndNotDoneFutures([], []))
+
+    def _future_callback(self, future):
+        if self.done():
+            return
+
+        self._done.append(future)
+
+        if self._return_when == FIRST_COMPLETED \
+           or len(self._done) == len(self._futures):
+            self._set_done()
+        elif self._return_when == FIRST_EXCEPTION \
+                and not future.cancelled() and future.exception() is not None:
+            self._set_done()
+
+    def _set_done(self):
+        # lists instead of sets, as the order must not change between replays
+        done = list(self._done)
+        not_done = [future for future in self._futures
+                    if not any(future is done_future for done_future in done)]
+        self.set_result(DoneAndNotDoneFutures(done, not_done))
+
+
+def as_completed(futures):
+    """
+    Iterate over *futures* in the order they complete. This lets you process
+    the results as soon as they are available, instead of waiting for all of
+    them to complete:
+
+    .. code-block:: python
+
+        @coroutine
+        def pipeline(self, items):
+            futures = [MyActivities.download(item) for item in items]
+            for future in as_completed(futures):
+                path = yield future
+                MyActivities.process(path)
+
+    :param futures: futures to wait on
+    :returns: iterator of futures, each completes with the result of the next
+        future to complete
+    :rtype: AsCompletedIterator
+    """
+    return AsCompletedIterator(futures)
+
+
+def wait(futures, return_when=ALL_COMPLETED):
+    """
+    Wait for *futures* to complete, similar to :py:func:`concurrent.futures.wait`.
+
+    .. code-block:: python
+
+        @coroutine
+        def first_two(self, items):
+            futures = [MyActivities.download(item) for item in items]
+            done, not_done = yield wait(futures, return_when=FIRST_COMPLETED)
+
+    Unlike with :py:func:`concurrent.futures.wait`, *done* and *not_done* are
+    lists and not sets, to keep the workflow replay deterministic. *done* is in
+    the order the futures completed, *not_done* in the order of *futures*.
+
+    :param futures: futures to wait on
+    :param str return_when: One of :py:data:`FIRST_COMPLETED`,
+        :py:data:`FIRST_EXCEPTION` or :py:data:`ALL_COMPLETED` (default).
+    :returns: future of a :py:data:`DoneAndNotDoneFutures` named tuple
+    :rtype: WaitFuture
+    """
+    return WaitFuture(futures, return_when)
@@ -14,6 +14,35 @@
 Various helper utils for the core
 """
 
+import traceback
+
+try:  # PY3k
+    import collections.abc
+    # noinspection PyUnresolvedReferences
+    Sequence = collections.abc.Sequence
+except ImportError:
+    import collections
+    Sequence = collections.Sequence
+
+# entry separating the stacks of the contexts in the async tracebacks
+CONTINUATION_FRAME = (None, 1, 'flow.core', '---continuation---')
+
+# file name -> True if the file is part of the framework
+_framework_files = dict()
+
+
+def is_framework_file(filename):
+    """
+    Returns True if *filename* is a part of the asynchronous framework. The
+    result is cached, as the same few files show up in every stack.
+    """
+    try:
+        return _framework_files[filename]
+    except KeyError:
+        # XXX Windows?
+        result = _framework_files[filename] = 'flow/core' in filename
+        return result
+
 
 def split_stack(stack):
     """
@@ -22,7 +51,7 @@ def split_stack(stack):
     stack_before, stack_after = list(), list()
     in_before = True
     for frame in stack:
-        if 'flow/core' in frame[0]:
+        if is_framework_file(frame[0]):
             in_before = False
         else:
             if in_before:
@@ -36,22 +65,17 @@ def filter_framework_frames(stack):
     """
     Returns a stack clean of framework frames
     """
-    result = list()
-    for frame in stack:
-        # XXX Windows?
-        if 'flow/core' not in frame[0]:
-            result.append(frame)
-    return result
+    return [frame for frame in stack if not is_framework_file(frame[0])]
 
 
 def get_context_with_traceback(context):
     """
     Returns the very first context that contains traceback information
     """
-    if context.tb_list:
-        return context
-    if context.parent:
-        return get_context_with_traceback(context.parent)
+    while context is not None:
+        if context.tb_list:
+            return context
+        context = context.parent
 
 
 def extract_stacks_from_contexts(context, stacks_list=None):
@@ -62,14 +86,72 @@ def extract_stacks_from_contexts(context, stacks_list=None):
     if stacks_list is None:
         stacks_list = list()
 
-    if context.stack_list:
-        stacks_list.append(context.stack_list)
+    while context is not None:
+        if context.stack_list:
+            stacks_list.append(context.stack_list)
+        context = context.parent
+
+    stacks_list.reverse()
+    return stacks_list
+
+
+class LazyTracebackList(Sequence):
+    """
+    Traceback entries of an exception raised in a task, prefixed with the
+    stacks of the contexts the task was started from.
+
+    Exceptions are often used for control flow (retries, cancellations), and
+    most of the tracebacks are never looked at, so the entries are only
+    assembled when the list is first accessed. Slicing returns a plain list
+    and so does pickling.
+    """
+
+    def __init__(self, stacks, tb):
+        """
+        :param list stacks: the context stacks, as returned by
+            :py:func:`extract_stacks_from_contexts`
+        :param tb: traceback object of the exception
+        """
+        self._stacks = stacks
+        self._tb = tb
+        self._tb_list = None
+
+    def _get_tb_list(self):
+        if self._tb_list is None:
+            tb_list = list()
+            for stack in self._stacks:
+                tb_list.extend(stack)
+                tb_list.append(CONTINUATION_FRAME)
+
+            tb_list.extend(filter_framework_frames(traceback.extract_tb(self._tb)))
+            self._tb_list = tb_list
+            self._stacks = self._tb = None  # gc
+        return self._tb_list
+
+    def __getitem__(self, index):
+        return self._get_tb_list()[index]
+
+    def __len__(self):
+        return len(self._get_tb_list())
+
+    def __iter__(self):
+        return iter(self._get_tb_list())
+
+    def __eq__(self, other):
+        if isinstance(other, LazyTracebackList):
+            other = other._get_tb_list()
+        return self._get_tb_list() == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return list, (self._get_tb_list(),)
 
-    if context.parent is not None:
-        return extract_stacks_from_contexts(context.parent, stacks_list)
-    else:
-        stacks_list.reverse()
-        return stacks_list
+    def __repr__(self):
+        return repr(self._get_tb_list())
 
 
 def log_task_context(context, logger):
@@ -14,6 +14,7 @@
 
 from ..core import BaseFuture, AnyFuture, AllFuture, CancelledError
 from ..core.async_task import AsyncTask
+from ..core.async_task_priority import PRIORITY_CONTINUATION
 
 
 class ActivityFuture(BaseFuture):
@@ -39,6 +40,7 @@ class ActivityFuture(BaseFuture):
         task = AsyncTask(self._future_callback, (future,),
                          name=self._future_callback.__name__)
         task.cancellable = False
+        task.priority = PRIORITY_CONTINUATION
         future.add_task(task)
 
     def _future_callback(self, future):
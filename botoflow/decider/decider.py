@@ -12,11 +12,14 @@
 # permissions and limitations under the License.
 import itertools
 import logging
+import os
+import re
 import warnings
 
 from ..context import get_context, set_context, DecisionContext
 from ..workflow_execution import WorkflowExecution
 from ..core import Future, AsyncEventLoop
+from ..core.async_profiler import AsyncProfiler
 from ..utils import pairwise
 from ..swf_exceptions import swf_exception_wrapper
 from ..history_events import (DecisionTaskCompleted, DecisionTaskScheduled, DecisionTaskTimedOut,
@@ -57,6 +60,11 @@ class Decider(object):
         self.identity = identity
         self.get_workflow = get_workflow
 
+        # use the priority scheduling mode of the AsyncEventLoop
+        self.priority_scheduling = False
+        # if set, save an event loop profile of every decision task into this directory
+        self.profiler_dir = None
+
         # noinspection PyCallingNonCallable
         self._poller = _Poller(worker, domain, task_list, identity)
 
@@ -67,7 +75,9 @@ class Decider(object):
         self._decision_id = 0
         self._event_to_id_table = {}
         self._decision_task_token = None
-        self._eventloop = AsyncEventLoop()
+        self._eventloop = AsyncEventLoop(priority_scheduling=self.priority_scheduling)
+        if self.profiler_dir is not None:
+            self._eventloop.profiler = AsyncProfiler()
 
         self._workflow_execution_handler = WorkflowExecutionHandler(self, self.task_list)
         self._activity_task_handler = ActivityTaskHandler(self, self.task_list)
@@ -89,6 +99,14 @@ class Decider(object):
     def decide(self):
         self._reset()
 
+        decision_task = self._poller.poll()
+        if decision_task is None:
+            return
+
+        with self.worker.tasks_in_progress:
+            self._decide(decision_task)
+
+    def _decide(self, decision_task):
         prev_context = None
         context = DecisionContext(self)
 
@@ -102,10 +120,6 @@ class Decider(object):
         decision_started = False
         last_decision_index = -1
 
-        decision_task = self._poller.poll()
-        if decision_task is None:
-            return
-
         workflow_execution = WorkflowExecution(decision_task.workflow_id, decision_task.run_id)
 
         self._decision_task_token = decision_task.task_token
@@ -171,6 +185,8 @@ class Decider(object):
             self._process_decisions()
         finally:
             set_context(prev_context)
+            if self._eventloop.profiler is not None:
+                self._save_profile(decision_task)
 
     def _handle_history_event(self, event):
         log.debug("Handling history event: %s", event)
@@ -189,6 +205,7 @@ class Decider(object):
     def _process_decisions(self):
         # drain all tasks before submitting more decisions
         self._eventloop.execute_all_tasks()
+        log.debug("Event loop stats: %s", self._eventloop.stats())
 
         if self._decision_task_token is not None:
             # get the workflow_state (otherwise known as execution context)
@@ -202,6 +219,20 @@ class Decider(object):
                     decisions=self._decisions.to_swf(),
                     executionContext=workflow_state)
 
+    def _save_profile(self, decision_task):
+        profiler = self._eventloop.profiler
+        report = profiler.report()
+        log.debug("Decision task profile:\n%s", report)
+
+        # run ids may contain characters that are not safe in file names
+        base_name = re.sub(r'[^\w.=-]', '_', "%s-%d" % (decision_task.run_id,
+                                                       decision_task.started_event_id))
+        base_path = os.path.join(self.profiler_dir, base_name)
+        with open(base_path + '.txt', 'w') as fileobj:
+            fileobj.write(report)
+        with open(base_path + '.collapsed', 'w') as fileobj:
+            profiler.dump_collapsed(fileobj)
+
     def _retry_cancellation(self, context):
         """A CancelWorkflowExecutionFailed event occurs when pending decisions leftover;
         this resends the cancel decision, alone, to retry.
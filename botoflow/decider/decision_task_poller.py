@@ -11,7 +11,6 @@
 # express or implied. See the License for the specific language governing
 # permissions and limitations under the License.
 
-import sys
 import time
 
 import six
@@ -101,11 +100,7 @@ class DecisionTaskPoller(object):
             return self.worker.client.poll_for_decision_task(**kwargs)
 
         except KeyboardInterrupt:
-            # sleep before actually exiting as the connection is not yet closed
-            # on the other end
-            sleep_time = 60 - (time.time() - poll_time)
-            six.print_("Exiting in {0}...".format(sleep_time), file=sys.stderr)
-            time.sleep(sleep_time)
+            self.worker._wait_for_interrupted_poll(poll_time)
             raise
 
     def poll(self):
@@ -14,6 +14,7 @@
 import types
 
 from . import decorator_descriptors
+from .activity_registry import register_activities
 from .activity_retrying import Retrying
 from .constants import USE_WORKER_TASK_LIST, CHILD_TERMINATE
 from .flow_types import ActivityType, SignalType, WorkflowType
@@ -195,6 +196,7 @@ def activities(task_list=USE_WORKER_TASK_LIST,
     """
 
     def _activities(cls):
+        names = []
         for name in dir(cls):
             try:
                 _func = getattr(cls, name)
@@ -207,6 +209,7 @@ def activities(task_list=USE_WORKER_TASK_LIST,
                                      activity_name_prefix)
 
                     activity_type = _func.swf_options['activity_type']
+                    names.append(name)
 
                     if data_converter is not None:
                         activity_type.data_converter = data_converter
@@ -224,6 +227,8 @@ def activities(task_list=USE_WORKER_TASK_LIST,
                     activity_type._set_activities_value(
                         'schedule_to_close_timeout', schedule_to_close_timeout)
 
+        # so the workers don't have to look for the activities again
+        register_activities(cls, names)
         return cls
 
     return _activities
@@ -11,9 +11,15 @@
 # express or implied. See the License for the specific language governing
 # permissions and limitations under the License.
 
+import sys
+
 from .workflow_worker import WorkflowWorker, GenericWorkflowWorker
 from .activity_worker import ActivityWorker
 from .threaded_workflow_executor import ThreadedWorkflowExecutor
 from .threaded_activity_executor import ThreadedActivityExecutor
 from .multiprocessing_workflow_executor import MultiprocessingWorkflowExecutor
 from .multiprocessing_activity_executor import MultiprocessingActivityExecutor
+from .process_pool_activity_executor import ProcessPoolActivityExecutor
+
+if sys.version_info >= (3, 7):
+    from .async_activity_executor import AsyncActivityExecutor
@@ -20,13 +20,16 @@ import logging
 
 import six
 
-from ..swf_exceptions import TypeAlreadyExistsError, swf_exception_wrapper
+from ..activity_registry import activity_names
+from ..swf_exceptions import swf_exception_wrapper
 
 from ..context import ActivityContext, get_context, set_context
 from ..core.exceptions import CancellationError, CancelledError
 
 from .base_worker import BaseWorker
 from .activity_task import ActivityTask
+from .heartbeat_manager import HeartbeatManager
+from .completion_reporter import CompletionReporter
 
 log = logging.getLogger(__name__)
 
@@ -74,6 +77,8 @@ class ActivityWorker(BaseWorker):
         super(ActivityWorker, self).__init__(session, aws_region, domain, task_list)
 
         self._activity_definitions = activity_definitions
+        self._heartbeat_manager = None
+        self._completion_reporter = None
         self._setup_activities()
         self._register_activities()
 
@@ -96,60 +101,29 @@ class ActivityWorker(BaseWorker):
             if inspect.isclass(activity):
                 raise TypeError("Activity definition must be an instance, not a class: {!r}".format(activity))
 
-            # extract activities info from the class
-            for name in dir(activity):
+            # the activity methods are indexed by the decorators, so we don't
+            # have to fish for them in every attribute
+            for name in activity_names(type(activity)):
                 try:
                     func = getattr(activity, name)
                 except AttributeError:
                     continue
 
-                # this is a bit tricky, but what it essentially does, it fishes for
-                # methods that are activities and maps them
-                if isinstance(func, functools.partial):
-                    if hasattr(func, 'swf_options'):
-                        if 'activity_type' in func.swf_options:
-                            activity_type = func.swf_options['activity_type']
-                            self._activity_names_to_methods[activity_type.name] \
-                                = (func, activity_type)
+                activity_type = func.swf_options['activity_type']
+                self._activity_names_to_methods[activity_type.name] = (func, activity_type)
 
     def _register_activities(self):
         """
         Registers the activities with SWF
         """
-        # get all the activities that are already registered, so we don't try to re-register them
-        with swf_exception_wrapper():
-            already_registered = {act['activityType']['name']: act['activityType']['version']
-                                  for act in self.client.list_activity_types(
-                domain=self.domain, registrationStatus='REGISTERED')['typeInfos']}
-
-        for act_name, func_info in six.iteritems(self._activity_names_to_methods):
-            activity_type = func_info[1]
-
-            if act_name in already_registered:
-                if already_registered[act_name] == activity_type.version:
-                    log.debug("Skipping registration of %s %s because it's already registered",
-                              act_name, activity_type.version)
-                    continue
+        self._type_registrar().register_activity_types(
+            [activity_type for _, activity_type in six.itervalues(self._activity_names_to_methods)])
 
-            if activity_type.skip_registration:
-                log.debug("Skipping activity '%s %s' registration because skip_registration is set to True",
-                          activity_type.name, activity_type.version)
-                continue
-
-            kwargs = activity_type.to_registration_options_dict(
-                domain=self.domain, worker_task_list=self.task_list)
-
-            try:
-                log.debug("Registering activity with the following "
-                          "options: %s", kwargs)
-                with swf_exception_wrapper():
-                    self.client.register_activity_type(**kwargs)
-            except TypeAlreadyExistsError:
-                log.debug("Activity '%s %s' already registered", activity_type.name, activity_type.version)
+    def poll_for_activity_task(self):
+        """Long-polls SWF for a single activity task.
 
-    def poll_for_activities(self):
-        """
-        Returns a closure function ready for execution
+        :returns: the activity task or None if the poll timed out
+        :rtype: awsflow.workers.activity_task.ActivityTask
         """
         poll_time = time.time()
         try:
@@ -160,71 +134,151 @@ class ActivityWorker(BaseWorker):
             if task_dict['startedEventId'] == 0:
                 return
 
-            task = ActivityTask(task_dict)
+            return ActivityTask(task_dict)
 
         except KeyboardInterrupt:
-            # seep before actually exiting as the connection is not yet closed
-            # on the other end
-            sleep_time = 60 - (time.time() - poll_time)
-            six.print_("Exiting in {0}...".format(sleep_time), file=sys.stderr)
-            time.sleep(sleep_time)
+            self._wait_for_interrupted_poll(poll_time)
             raise
 
-        func, activity_type = self._activity_names_to_methods[task.name]
+    def poll_for_activities(self):
+        """
+        Returns a closure function ready for execution
+        """
+        task = self.poll_for_activity_task()
+        if task is None:
+            return
+
+        # fail early for unknown activities
+        self.get_activity(task)
+        return functools.partial(self.process_activity_task, task)
 
-        def process_activity():
-            saved_context = None
-            try:
-                saved_context = get_context()
-            except AttributeError:
-                pass
+    def get_activity(self, task):
+        """Returns the activity implementation for *task*
+
+        :type task: awsflow.workers.activity_task.ActivityTask
+        :returns: tuple of the activity method and its
+            :py:class:`~botoflow.flow_types.ActivityType`
+        """
+        return self._activity_names_to_methods[task.name]
+
+    def process_activity_task(self, task):
+        """Runs the activity of *task* and reports the result to SWF.
+
+        :type task: awsflow.workers.activity_task.ActivityTask
+        """
+        with self.tasks_in_progress:
+            self.respond(self.execute_activity_task(task))
+
+    def execute_activity_task(self, task):
+        """Runs the activity of *task* within an
+        :py:class:`~botoflow.context.ActivityContext`, without reporting the
+        result.
+
+        :type task: awsflow.workers.activity_task.ActivityTask
+        :returns: the response to pass to :py:meth:`respond`
+        """
+        func, activity_type = self.get_activity(task)
+
+        saved_context = None
+        try:
+            saved_context = get_context()
+        except AttributeError:
+            pass
+
+        context = ActivityContext(self, task)
+        set_context(context)
+        try:
+            fargs, kwargs = self._load_activity_input(task, activity_type)
 
-            context = ActivityContext(self, task)
-            set_context(context)
             try:
-                fargs, kwargs = activity_type.data_converter.loads(task.input)
+                log.debug("Running activity with args: %r, "
+                          "kwargs: %r", fargs, kwargs)
+                result = func(*fargs, **kwargs)
+                log.debug("Activity returned: %r", result)
+            except Exception as err:
+                _, _, tb = sys.exc_info()
+                # the [1:] slices out the framework part so that it looks
+                # like the code ran alone
+                return self._activity_failed_response(
+                    task, activity_type, err, traceback.extract_tb(tb)[1:])
+
+            return self._activity_completed_response(task, activity_type, result)
+        finally:
+            set_context(saved_context)
+            if self._heartbeat_manager is not None:
+                self._heartbeat_manager.discard(task)
+
+    @staticmethod
+    def _load_activity_input(task, activity_type):
+        """Returns the args and kwargs of the activity from the *task*
+        input
+        """
+        fargs, kwargs = activity_type.data_converter.loads(task.input)
 
-                # make sure kwargs are non-unicode in 2.6
-                if sys.version_info[0:2] == (2, 6):
-                    kwargs = dict([(str(k), v)
-                                   for k, v in six.iteritems(kwargs)])
+        # make sure kwargs are non-unicode in 2.6
+        if sys.version_info[0:2] == (2, 6):
+            kwargs = dict([(str(k), v)
+                           for k, v in six.iteritems(kwargs)])
+        return fargs, kwargs
 
-                try:
-                    log.debug("Running activity with args: %r, "
-                              "kwargs: %r", fargs, kwargs)
-                    result = func(*fargs, **kwargs)
-                    log.debug("Activity returned: %r", result)
-                    if not activity_type.manual:
-                        with swf_exception_wrapper():
-                            self.client.respond_activity_task_completed(
-                                taskToken=task.token,
-                                result=activity_type.data_converter.dumps(result))
-                    else:
-                        log.debug("Activity '%s %s' is a manual activity."
-                                  "Can be marked complete only when instructed by a human",
-                                  activity_type.name, activity_type.version)
-                except Exception as err:
-                    _, _, tb = sys.exc_info()
-                    tb_list = traceback.extract_tb(tb)
-
-                    log.debug("Activity raised an exception: %s, %s",
-                              err, tb_list)
-                    # the [1:] slices out the framework part so that it looks
-                    # like the code ran alone
-                    details = activity_type.data_converter.dumps(
-                        [err, tb_list[1:]])
-                    with swf_exception_wrapper():
-                        if isinstance(err, (CancellationError, CancelledError)):
-                            self.client.respond_activity_task_canceled(
-                                taskToken=task.token, details=details)
-                        else:
-                            self.client.respond_activity_task_failed(
-                                taskToken=task.token, reason='', details=details)
-
-            finally:
-                set_context(saved_context)
-
-        return process_activity
+    @staticmethod
+    def _activity_completed_response(task, activity_type, result):
+        """Returns the response for an activity that returned *result*, or
+        None for manual activities
+
+        The response is a tuple of the SWF client method name and its
+        keyword arguments, so it can be passed between processes.
+        """
+        if activity_type.manual:
+            log.debug("Activity '%s %s' is a manual activity."
+                      "Can be marked complete only when instructed by a human",
+                      activity_type.name, activity_type.version)
+            return None
+
+        return ('respond_activity_task_completed',
+                {'taskToken': task.token,
+                 'result': activity_type.data_converter.dumps(result)})
+
+    @staticmethod
+    def _activity_failed_response(task, activity_type, err, tb_list):
+        """Returns the response for an activity that raised *err*
+
+        See :py:meth:`_activity_completed_response`.
+        """
+        log.debug("Activity raised an exception: %s, %s", err, tb_list)
+        details = activity_type.data_converter.dumps([err, tb_list])
+
+        if isinstance(err, (CancellationError, CancelledError)):
+            return ('respond_activity_task_canceled',
+                    {'taskToken': task.token, 'details': details})
+        return ('respond_activity_task_failed',
+                {'taskToken': task.token, 'reason': '', 'details': details})
+
+    def respond(self, response):
+        """Reports the result of an activity task to SWF, or queues it to
+        be reported in the background if :py:attr:`background_responses` are
+        on.
+
+        :param response: response returned from
+            :py:meth:`execute_activity_task`
+        """
+        if self._completion_reporter is not None:
+            self._completion_reporter.report(response)
+        else:
+            self.send_response(response)
+
+    def send_response(self, response):
+        """Reports the result of an activity task to SWF right away
+
+        :param response: response returned from
+            :py:meth:`execute_activity_task`
+        """
+        if response is None:
+            return
+
+        method_name, kwargs = response
+        with swf_exception_wrapper():
+            getattr(self.client, method_name)(**kwargs)
 
     def request_heartbeat(self, task, details=None):
         """Sends heartbeat of activity in SWF and returns response.
@@ -237,6 +291,94 @@ class ActivityWorker(BaseWorker):
         """
         return self.client.record_activity_task_heartbeat(taskToken=task.token, details=details)
 
+    @property
+    def background_heartbeats(self):
+        """If True, the activity heartbeats are recorded from a background
+        thread by a :py:class:`~botoflow.workers.heartbeat_manager.HeartbeatManager`.
+        Default is False.
+
+        :py:meth:`~botoflow.context.ActivityContext.heartbeat` then never
+        blocks and can be called as often as needed: at most one heartbeat per
+        :py:attr:`heartbeat_interval` (or half of the registered heartbeat
+        timeout of the activity, if shorter) is sent with the latest details.
+        The cancel requests are only noticed on the heartbeat after the one
+        that returned them.
+        """
+        return self._heartbeat_manager is not None
+
+    @background_heartbeats.setter
+    def background_heartbeats(self, enabled):
+        if enabled and self._heartbeat_manager is None:
+            self._heartbeat_manager = HeartbeatManager(self, self.heartbeat_interval)
+        elif not enabled and self._heartbeat_manager is not None:
+            self._heartbeat_manager.stop()
+            self._heartbeat_manager = None
+
+    @property
+    def heartbeat_interval(self):
+        """Maximum seconds between two background heartbeats of an activity
+        task. Default is 30.
+        """
+        return self._heartbeat_interval
+
+    @heartbeat_interval.setter
+    def heartbeat_interval(self, value):
+        self._heartbeat_interval = value
+        if self._heartbeat_manager is not None:
+            self._heartbeat_manager.max_interval = value
+
+    _heartbeat_interval = 30.0
+
+    @property
+    def background_responses(self):
+        """If True, the results of the activity tasks are reported to SWF
+        from a background thread by a
+        :py:class:`~botoflow.workers.completion_reporter.CompletionReporter`
+        and the worker can poll for the next task right away. Default is
+        False.
+
+        The throttled reports are retried. Use :py:attr:`completion_reporter`
+        to tune the reporter.
+        """
+        return self._completion_reporter is not None
+
+    @background_responses.setter
+    def background_responses(self, enabled):
+        if enabled and self._completion_reporter is None:
+            self._completion_reporter = CompletionReporter(self)
+        elif not enabled and self._completion_reporter is not None:
+            self._completion_reporter.flush()
+            self._completion_reporter = None
+
+    @property
+    def completion_reporter(self):
+        """Returns the :py:class:`~botoflow.workers.completion_reporter.CompletionReporter`
+        or None if :py:attr:`background_responses` are off
+        """
+        return self._completion_reporter
+
+    @completion_reporter.setter
+    def completion_reporter(self, reporter):
+        self._completion_reporter = reporter
+
+    def flush_responses(self, timeout=None):
+        """Waits till the responses queued by :py:meth:`respond` are reported
+
+        :param float timeout: Maximum seconds to wait, forever if None.
+        :returns: True if all the responses were reported in time
+        :rtype: bool
+        """
+        if self._completion_reporter is None:
+            return True
+        return self._completion_reporter.flush(timeout)
+
+    @property
+    def heartbeat_manager(self):
+        """Returns the :py:class:`~botoflow.workers.heartbeat_manager.HeartbeatManager`
+        or None if :py:attr:`background_heartbeats` are off
+        """
+        return self._heartbeat_manager
+
     def run(self):
         """Run this worker forever (or till SIGINT).
         """
@@ -0,0 +1,276 @@
+# Copyright 2013 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://aws.amazon.com/apache2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import sys
+import inspect
+import asyncio
+import functools
+import threading
+import traceback
+import contextvars
+import logging
+
+from concurrent.futures import ThreadPoolExecutor
+
+from ..context import ActivityContext, set_context
+from ..core.exceptions import CancellationError
+from .threaded_executor import ThreadedExecutor
+
+log = logging.getLogger(__name__)
+
+
+class AsyncActivityContext(ActivityContext):
+    """The :py:class:`~botoflow.context.ActivityContext` of activities run
+    by the :py:class:`AsyncActivityExecutor`.
+
+    Since recording a heartbeat is a blocking call, :py:meth:`heartbeat` only
+    schedules it in the background and never blocks the event loop (using
+    the worker's heartbeat manager, if its ``background_heartbeats`` are on).
+    Use ``await context.heartbeat_async()`` to wait for the result instead.
+    """
+
+    def __init__(self, worker, task, loop, executor):
+        super(AsyncActivityContext, self).__init__(worker, task)
+        self._loop = loop
+        self._executor = executor
+        self._heartbeat_future = None
+        self._pending_heartbeat = None
+        self.cancel_requested = False
+
+    def heartbeat(self, details=None):
+        """Schedules a heartbeat of the current activity without blocking.
+
+        If a heartbeat is already being sent, only the latest *details* are
+        sent after it finishes, so calling this often is cheap.
+
+        :param details: If specified, contains details about the progress of the task.
+        :type details: str
+        :raises CancellationError: if any of the previous heartbeats returned
+            that the cancel of the activity was requested.
+        """
+        if self.worker.heartbeat_manager is not None:
+            # already non-blocking
+            return super(AsyncActivityContext, self).heartbeat(details)
+
+        self._raise_if_cancel_requested()
+        if self._heartbeat_future is not None:
+            # coalesce with the heartbeat in flight
+            self._pending_heartbeat = (details,)
+            return
+        self._send_heartbeat(details)
+
+    async def heartbeat_async(self, details=None):
+        """Heartbeats the current activity and waits for the result.
+
+        :param details: If specified, contains details about the progress of the task.
+        :type details: str
+        :raises CancellationError: if cancel was requested.
+        """
+        result = await self._loop.run_in_executor(
+            self._executor, self.worker.request_heartbeat, self.task, details)
+        if result['cancelRequested']:
+            self.cancel_requested = True
+        self._raise_if_cancel_requested()
+
+    def _raise_if_cancel_requested(self):
+        if self.cancel_requested:
+            raise CancellationError('Cancel was requested during activity heartbeat')
+
+    def _send_heartbeat(self, details):
+        self._heartbeat_future = self._loop.run_in_executor(
+            self._executor, self.worker.request_heartbeat, self.task, details)
+        self._heartbeat_future.add_done_callback(self._heartbeat_done)
+
+    def _heartbeat_done(self, future):
+        self._heartbeat_future = None
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            log.warning("Activity heartbeat failed: %r", future.exception())
+        elif future.result()['cancelRequested']:
+            self.cancel_requested = True
+
+        if self._pending_heartbeat is not None:
+            details, = self._pending_heartbeat
+            self._pending_heartbeat = None
+            self._send_heartbeat(details)
+
+
+class AsyncActivityExecutor(ThreadedExecutor):
+    """This is an executor for :py:class:`~.ActivityWorker` that runs many
+    activities concurrently on a single asyncio event loop (in a background
+    thread). It is meant for I/O-bound activities written as ``async def``
+    methods:
+
+    .. code-block:: python
+
+        @activities(schedule_to_start_timeout=60,
+                    start_to_close_timeout=60)
+        class HttpActivities(object):
+
+            @activity(version='1.0')
+            async def fetch(self, url):
+                async with aiohttp.ClientSession() as session:
+                    async with session.get(url) as response:
+                        return await response.text()
+
+        executor = AsyncActivityExecutor(ActivityWorker(
+            session, 'us-east-1', 'SOMEDOMAIN', 'MYTASKLIST', HttpActivities()))
+        executor.start(pollers=2, max_concurrent_activities=200)
+
+    The long polls and the other SWF calls are blocking, so they run in
+    threads. Regular (non ``async``) activities run in a thread pool too.
+
+    A poll is only started when there's a free slot for the task it returns,
+    so once *max_concurrent_activities* activities are running, the executor
+    stops polling until some of them finish.
+
+    Requires Python 3.7+.
+    """
+
+    def start(self, pollers=1, max_concurrent_activities=100):
+        """Start the worker. This method does not block.
+
+        :param int pollers: Count of concurrent long polls.
+        :param int max_concurrent_activities: Maximum count of activities
+            running at the same time.
+        """
+        if pollers < 1:
+            raise ValueError("pollers count must be greater than 0")
+        if max_concurrent_activities < 1:
+            raise ValueError("max_concurrent_activities must be greater than 0")
+
+        super(AsyncActivityExecutor, self).start()
+        self._running_activities = 0
+        # the polls and the activities' SWF calls run in threads at the same time
+        self._worker._reserve_connections(pollers + max_concurrent_activities)
+
+        self._thread_queue.put(0)
+        thread = threading.Thread(target=self._run_event_loop,
+                                  args=(pollers, max_concurrent_activities))
+        thread.daemon = True
+        thread.name = "%r Thread-0" % self
+        thread.start()
+
+    def _handle_exception(self, err):
+        _, _, tb = sys.exc_info()
+        tb_list = traceback.extract_tb(tb)
+        handler = self._worker.unhandled_exception_handler
+        handler(err, tb_list)
+
+    def _run_event_loop(self, pollers, max_concurrent_activities):
+        self._thread_queue.get()
+        log.debug("Event loop %s started", threading.current_thread().name)
+
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        # the long polls get their own threads, so they never wait behind
+        # activities or responses
+        poll_executor = ThreadPoolExecutor(pollers)
+        executor = ThreadPoolExecutor(max_concurrent_activities)
+        try:
+            self.initializer(self._worker)
+            loop.run_until_complete(self._run(loop, poll_executor, executor, pollers,
+                                              max_concurrent_activities))
+        except Exception as err:
+            self._handle_exception(err)
+        finally:
+            log.debug("Event loop %s terminating", threading.current_thread().name)
+            poll_executor.shutdown(wait=False)
+            executor.shutdown(wait=False)
+            loop.close()
+            self._thread_queue.task_done()
+
+    async def _run(self, loop, poll_executor, executor, pollers, max_concurrent_activities):
+        slots = asyncio.Semaphore(max_concurrent_activities)
+        running = set()
+
+        await asyncio.gather(*[self._poll(loop, poll_executor, executor, slots, running)
+                               for _ in range(pollers)])
+
+        # let the running activities finish before exiting
+        if running:
+            await asyncio.wait(running)
+
+    async def _poll(self, loop, poll_executor, executor, slots, running):
+        while not self._worker_shutdown:
+            # backpressure, we only poll if there's a slot for the task
+            await slots.acquire()
+            if self._worker_shutdown:
+                slots.release()
+                return
+
+            task = None
+            try:
+                task = await loop.run_in_executor(poll_executor, self._worker.poll_for_activity_task)
+            except Exception as err:
+                self._handle_exception(err)
+
+            if task is None:
+                slots.release()
+                continue
+
+            activity = loop.create_task(self._process(loop, executor, task))
+            running.add(activity)
+            self._running_activities = len(running)
+            activity.add_done_callback(functools.partial(self._activity_done, running, slots))
+
+    def _activity_done(self, running, slots, activity):
+        running.discard(activity)
+        self._running_activities = len(running)
+        slots.release()
+
+    def _tasks_in_progress(self):
+        return self._running_activities
+
+    def _flush_responses(self, timeout):
+        return self._worker.flush_responses(timeout)
+
+    async def _process(self, loop, executor, task):
+        worker = self._worker
+        try:
+            func, activity_type = worker.get_activity(task)
+            if inspect.iscoroutinefunction(getattr(func, 'func', func)):
+                response = await self._execute_coroutine_activity(loop, executor, task, func,
+                                                                  activity_type)
+            else:
+                # copy the context, so the activity can see its ActivityContext
+                response = await loop.run_in_executor(
+                    executor, contextvars.copy_context().run, worker.execute_activity_task, task)
+
+            await loop.run_in_executor(executor, worker.respond, response)
+        except Exception as err:
+            self._handle_exception(err)
+
+    async def _execute_coroutine_activity(self, loop, executor, task, func, activity_type):
+        worker = self._worker
+        # every asyncio task runs in its own copy of the context
+        set_context(AsyncActivityContext(worker, task, loop, executor))
+
+        fargs, kwargs = worker._load_activity_input(task, activity_type)
+        try:
+            log.debug("Running activity with args: %r, "
+                      "kwargs: %r", fargs, kwargs)
+            result = await func(*fargs, **kwargs)
+            log.debug("Activity returned: %r", result)
+        except Exception as err:
+            _, _, tb = sys.exc_info()
+            # the [1:] slices out the framework part so that it looks
+            # like the code ran alone
+            return worker._activity_failed_response(
+                task, activity_type, err, traceback.extract_tb(tb)[1:])
+        finally:
+            if worker.heartbeat_manager is not None:
+                worker.heartbeat_manager.discard(task)
+
+        return worker._activity_completed_response(task, activity_type, result)
@@ -0,0 +1,216 @@
+# Copyright 2013 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://aws.amazon.com/apache2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+"""
+Autoscaling of the count of pollers and workers of the activity executors
+(see :py:class:`~botoflow.workers.threaded_activity_executor.ThreadedActivityExecutor`).
+"""
+
+import time
+import threading
+import logging
+
+from collections import namedtuple
+
+log = logging.getLogger(__name__)
+
+
+#: Load of the executor observed over one autoscaling interval
+AutoscalingSample = namedtuple('AutoscalingSample',
+                               'polls empty_poll_rate queue_latency utilization')
+
+
+class AutoscalingPolicy(object):
+    """Decides how many pollers and workers the executor should run.
+
+    Every *interval* seconds the executor load is sampled:
+
+    * *utilization* -- the ratio of time the workers were busy,
+    * *queue_latency* -- the average time the tasks waited for a worker
+      after being polled (the activity tasks returned by SWF carry no
+      scheduled timestamp, so the time spent in the task list is unknown),
+    * *empty_poll_rate* -- the ratio of polls that returned no task.
+
+    The workers are doubled (up to *max_workers*) as soon as they are
+    saturated, that is the utilization is at least *scale_up_utilization* or
+    the tasks wait longer than *max_queue_latency*. A poller is added when
+    the workers have room and every poll returns a task. To avoid flapping,
+    a worker or poller is only removed after *scale_down_intervals*
+    consecutive intervals of low utilization or of mostly empty polls.
+
+    :param int min_pollers: Minimum count of pollers.
+    :param int max_pollers: Maximum count of pollers.
+    :param int min_workers: Minimum count of workers.
+    :param int max_workers: Maximum count of workers.
+    :param float interval: Seconds between two autoscaling decisions.
+    :param float scale_up_utilization: Utilization to add workers at.
+    :param float scale_down_utilization: Utilization to remove workers at.
+    :param float max_queue_latency: Seconds a task may wait for a worker.
+    :param float max_empty_poll_rate: Empty poll rate to remove pollers at.
+    :param int scale_down_intervals: Count of intervals the load must stay
+        low before scaling down.
+    """
+
+    def __init__(self, min_pollers=1, max_pollers=4, min_workers=1, max_workers=16,
+                 interval=10.0, scale_up_utilization=0.8, scale_down_utilization=0.3,
+                 max_queue_latency=1.0, max_empty_poll_rate=0.5, scale_down_intervals=3):
+        if not 1 <= min_pollers <= max_pollers:
+            raise ValueError("must be 1 <= min_pollers <= max_pollers")
+        if not 1 <= min_workers <= max_workers:
+            raise ValueError("must be 1 <= min_workers <= max_workers")
+        if not 0 <= scale_down_utilization < scale_up_utilization:
+            raise ValueError("must be 0 <= scale_down_utilization < scale_up_utilization")
+
+        self.min_pollers = min_pollers
+        self.max_pollers = max_pollers
+        self.min_workers = min_workers
+        self.max_workers = max_workers
+        self.interval = interval
+        self.scale_up_utilization = scale_up_utilization
+        self.scale_down_utilization = scale_down_utilization
+        self.max_queue_latency = max_queue_latency
+        self.max_empty_poll_rate = max_empty_poll_rate
+        self.scale_down_intervals = scale_down_intervals
+
+        self._poller_down_votes = 0
+        self._worker_down_votes = 0
+
+    def clamp(self, pollers, workers):
+        """Returns the *pollers* and *workers* counts within the bounds"""
+        return (min(max(pollers, self.min_pollers), self.max_pollers),
+                min(max(workers, self.min_workers), self.max_workers))
+
+    def scale(self, pollers, workers, sample):
+        """Returns the new pollers and workers counts for the load *sample*
+
+        :param int pollers: Current count of pollers.
+        :param int workers: Current count of workers.
+        :type sample: AutoscalingSample
+        :rtype: tuple
+        """
+        saturated = (sample.utilization >= self.scale_up_utilization or
+                     sample.queue_latency > self.max_queue_latency)
+
+        if saturated:
+            self._worker_down_votes = 0
+            workers *= 2
+        elif sample.utilization <= self.scale_down_utilization:
+            self._worker_down_votes += 1
+            if self._worker_down_votes >= self.scale_down_intervals:
+                self._worker_down_votes = 0
+                workers -= 1
+        else:
+            self._worker_down_votes = 0
+
+        if sample.polls and sample.empty_poll_rate > self.max_empty_poll_rate:
+            self._poller_down_votes += 1
+            if self._poller_down_votes >= self.scale_down_intervals:
+                self._poller_down_votes = 0
+                pollers -= 1
+        else:
+            self._poller_down_votes = 0
+            if sample.polls and not saturated and sample.empty_poll_rate == 0:
+                # there's work waiting in the task list, but the workers are
+                # not busy, so the pollers can't keep up
+                pollers += 1
+
+        return self.clamp(pollers, workers)
+
+
+class Autoscaler(object):
+    """**INTERNAL**
+    Background thread that periodically samples the load of an executor
+    and resizes it according to the :py:class:`AutoscalingPolicy`.
+    """
+
+    def __init__(self, executor, policy):
+        self._executor = executor
+        self._policy = policy
+        self._stop_event = threading.Event()
+        self._last_stats = None
+        self._last_time = None
+
+        self.last_sample = None
+        self.scale_ups = 0
+        self.scale_downs = 0
+
+    def start(self):
+        self._last_stats = self._executor.stats()
+        self._last_time = time.time()
+
+        thread = threading.Thread(target=self._run)
+        thread.daemon = True
+        thread.name = "%r Autoscaler" % self._executor
+        thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _run(self):
+        while not self._stop_event.wait(self._policy.interval):
+            try:
+                self.tick()
+            except Exception:
+                log.exception("Autoscaling of %r failed", self._executor)
+
+    def sample(self, stats, elapsed):
+        """Returns the load sample since the previous stats"""
+        last = self._last_stats
+        polls = ((stats['tasks_polled'] - last['tasks_polled']) +
+                 (stats['empty_polls'] - last['empty_polls']))
+        empty_poll_rate = 0.0
+        if polls:
+            empty_poll_rate = float(stats['empty_polls'] - last['empty_polls']) / polls
+
+        started = stats['tasks_started'] - last['tasks_started']
+        queue_latency = 0.0
+        if started:
+            queue_latency = (stats['queue_wait_time'] - last['queue_wait_time']) / started
+
+        utilization = 0.0
+        if elapsed > 0:
+            busy_time = stats['busy_time'] - last['busy_time']
+            utilization = min(busy_time / (elapsed * stats['workers']), 1.0)
+
+        return AutoscalingSample(polls, empty_poll_rate, queue_latency, utilization)
+
+    def tick(self):
+        """Samples the executor load and resizes it if needed"""
+        now = time.time()
+        stats = self._executor.stats()
+        sample = self.sample(stats, now - self._last_time)
+        self._last_stats = stats
+        self._last_time = now
+        self.last_sample = sample
+
+        pollers, workers = stats['pollers'], stats['workers']
+        new_pollers, new_workers = self._policy.scale(pollers, workers, sample)
+        if (new_pollers, new_workers) == (pollers, workers):
+            return
+
+        log.info("Autoscaling %r from %d pollers/%d workers to %d/%d, load: %s",
+                 self._executor, pollers, workers, new_pollers, new_workers, sample)
+        if new_pollers + new_workers > pollers + workers:
+            self.scale_ups += 1
+        else:
+            self.scale_downs += 1
+        self._executor.resize(new_pollers, new_workers)
+
+    def stats(self):
+        """Returns the autoscaling metrics
+
+        :returns: dict with the *last_sample*, *scale_ups* and *scale_downs*
+        :rtype: dict
+        """
+        return {'last_sample': self.last_sample,
+                'scale_ups': self.scale_ups,
+                'scale_downs': self.scale_downs}
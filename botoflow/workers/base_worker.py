@@ -12,19 +12,49 @@
 # permissions and limitations under the License.
 
 import os
+import sys
+import time
 import socket
 import threading
 import logging
 
 from copy import copy
 
+import six
 from botocore.session import Session
 
 from ..core import async_traceback
+from ..client_pool import get_client
+from .type_registrar import TypeRegistrar
 
 log = logging.getLogger(__name__)
 
 
+class TaskCounter(object):
+    """Thread-safe count of the tasks a worker has in progress. Used as a
+    context manager around the processing of every task.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0
+
+    def __enter__(self):
+        with self._lock:
+            self.value += 1
+        return self
+
+    def __exit__(self, exc_type, err, tb):
+        with self._lock:
+            self.value -= 1
+
+    def __getstate__(self):
+        return {}
+
+    def __setstate__(self, dct):
+        self.__init__()
+
+
 class BaseWorker(object):
     """
     Base for the Workflow and Activity workers
@@ -36,6 +66,7 @@ class BaseWorker(object):
                             "of botocore.session.Session")
 
         self._identity = None
+        self._tasks_in_progress = TaskCounter()
         self._session = session
         self._aws_region = aws_region
 
@@ -83,11 +114,42 @@ class BaseWorker(object):
         """
         try:
             return self._client
-        except AttributeError:  # create a new client
-            self._client = self._session.create_client(
-                service_name='swf', region_name=self._aws_region)
+        except AttributeError:  # get a client shared with the other workers
+            self._client = get_client(self._session, self._aws_region,
+                                      self._max_pool_connections)
             return self._client
 
+    @property
+    def max_pool_connections(self):
+        """Minimum size of the HTTP connection pool of the :py:attr:`client`,
+        which should be at least the count of the threads using the client at
+        the same time. The executors raise it on start to fit their threads.
+        Default is None, which is botocore's default (10).
+
+        The client is shared with the other workers (and workflow starters)
+        of the same session and region, see
+        :py:class:`~botoflow.client_pool.ClientPool`.
+        """
+        return self._max_pool_connections
+
+    @max_pool_connections.setter
+    def max_pool_connections(self, value):
+        if value != self._max_pool_connections:
+            self._max_pool_connections = value
+            # get a client with a large enough pool on next use
+            self.__dict__.pop('_client', None)
+
+    _max_pool_connections = None
+
+    def _reserve_connections(self, count):
+        """Makes sure the client's connection pool has room for at least
+        *count* connections, called by the executors on start.
+        """
+        self.max_pool_connections = max(self._max_pool_connections or 0, count)
+
+    def _type_registrar(self):
+        return TypeRegistrar(self.client, self.domain, self.task_list)
+
     @property
     def domain(self):
         """Returns the worker's domain"""
@@ -126,6 +188,50 @@ class BaseWorker(object):
     def identity(self, value):
         self._identity = value
 
+    @property
+    def tasks_in_progress(self):
+        """Returns the count of tasks (that were polled and are not finished
+        yet) as a :py:class:`TaskCounter`. Executors use it to wait for the
+        tasks in progress when draining.
+        """
+        return self._tasks_in_progress
+
+    @tasks_in_progress.setter
+    def tasks_in_progress(self, counter):
+        self._tasks_in_progress = counter
+
+    @property
+    def poll_interrupt_wait(self):
+        """Seconds since the start of a poll to wait on KeyboardInterrupt
+        before exiting. Default is 60.
+
+        SWF may still hand a task to a poll that was interrupted on our end,
+        until the poll times out on the SWF end. Such task would only be
+        retried after it times out, which is what the wait prevents. Setting
+        this to 0 exits right away. Pressing Ctrl-C again while waiting
+        exits right away too.
+        """
+        return self._poll_interrupt_wait
+
+    @poll_interrupt_wait.setter
+    def poll_interrupt_wait(self, value):
+        self._poll_interrupt_wait = value
+
+    _poll_interrupt_wait = 60
+
+    def _wait_for_interrupted_poll(self, poll_time):
+        # sleep before actually exiting as the connection is not yet closed
+        # on the other end
+        sleep_time = self.poll_interrupt_wait - (time.time() - poll_time)
+        if sleep_time <= 0:
+            return
+        six.print_("Exiting in {0:.0f}s, press Ctrl-C again to exit now...".format(sleep_time),
+                   file=sys.stderr)
+        try:
+            time.sleep(sleep_time)
+        except KeyboardInterrupt:
+            pass
+
     def run(self):
         """Should be implemented by the worker
 
@@ -0,0 +1,190 @@
+# Copyright 2013 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://aws.amazon.com/apache2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+"""
+Background reporting of the activity task results (see
+:py:attr:`~botoflow.workers.activity_worker.ActivityWorker.background_responses`).
+"""
+
+import sys
+import time
+import threading
+import traceback
+import logging
+
+from six.moves import queue
+
+from ..swf_exceptions import ThrottlingException, InternalFailureError, UnknownResourceError
+
+log = logging.getLogger(__name__)
+
+
+class CompletionReporter(object):
+    """Reports the results of the activity tasks to SWF from background
+    threads, so the worker threads can go back to polling right after the
+    activity returns.
+
+    The responses wait in a queue of at most *max_queue_size* responses,
+    :py:meth:`report` blocks while the queue is full, so a worker never gets
+    too far ahead of SWF. The reports that were throttled or failed on the
+    SWF end are retried up to *max_retries* times, with an exponential
+    backoff starting at *retry_delay* seconds.
+
+    Every response counts as a task in progress of the worker until it's
+    reported, so draining the executors waits for it.
+
+    :param worker: the worker to report the results with
+    :type worker: botoflow.workers.activity_worker.ActivityWorker
+    :param int max_queue_size: Maximum count of responses waiting to be reported.
+    :param int threads: Count of reporting threads.
+    :param int max_retries: Maximum count of retries of a throttled report.
+    :param float retry_delay: Seconds to wait before the first retry.
+    """
+
+    #: the errors worth retrying the report on
+    retry_errors = (ThrottlingException, InternalFailureError)
+
+    def __init__(self, worker, max_queue_size=100, threads=1, max_retries=5, retry_delay=0.5):
+        if max_queue_size < 1:
+            raise ValueError("max_queue_size must be greater than 0")
+        if threads < 1:
+            raise ValueError("threads count must be greater than 0")
+
+        self.worker = worker
+        self.max_queue_size = max_queue_size
+        self.threads = threads
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+
+        self._queue = queue.Queue(max_queue_size)
+        self._condition = threading.Condition()
+        self._pending = 0
+        self._started = False
+
+        self.responses_reported = 0
+        self.retries = 0
+        self.failures = 0
+
+    def __getstate__(self):
+        return {'worker': self.worker,
+                'max_queue_size': self.max_queue_size,
+                'threads': self.threads,
+                'max_retries': self.max_retries,
+                'retry_delay': self.retry_delay}
+
+    def __setstate__(self, dct):
+        self.__init__(**dct)
+
+    def report(self, response):
+        """Queues *response* to be reported, blocks while the queue is full.
+
+        :param response: response returned from
+            :py:meth:`~botoflow.workers.activity_worker.ActivityWorker.execute_activity_task`
+        """
+        if response is None:
+            return
+
+        tasks_in_progress = self.worker.tasks_in_progress
+        tasks_in_progress.__enter__()
+        with self._condition:
+            self._pending += 1
+            if not self._started:
+                self._start_threads()
+        self._queue.put((response, tasks_in_progress))
+
+    def flush(self, timeout=None):
+        """Waits till all the queued responses are reported.
+
+        :param float timeout: Maximum seconds to wait, forever if None.
+        :returns: True if all the responses were reported in time
+        :rtype: bool
+        """
+        deadline = None
+        if timeout is not None:
+            deadline = time.time() + timeout
+
+        with self._condition:
+            while self._pending:
+                if deadline is None:
+                    self._condition.wait()
+                else:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        return False
+                    self._condition.wait(remaining)
+        return True
+
+    def stats(self):
+        """Returns a dict of the count of the responses *pending* and
+        *reported*, the count of *retries* and of *failures* (responses
+        given up on).
+        """
+        with self._condition:
+            return {'pending': self._pending,
+                    'reported': self.responses_reported,
+                    'retries': self.retries,
+                    'failures': self.failures}
+
+    def _start_threads(self):
+        # called with the _condition held
+        for i in range(self.threads):
+            thread = threading.Thread(target=self._run)
+            thread.daemon = True
+            thread.name = "%r CompletionReporter-%d" % (self.worker, i)
+            thread.start()
+        self._started = True
+
+    def _run(self):
+        while True:
+            response, tasks_in_progress = self._queue.get()
+            reported = False
+            try:
+                reported = self._send(response)
+            finally:
+                tasks_in_progress.__exit__(None, None, None)
+                with self._condition:
+                    self._pending -= 1
+                    if reported:
+                        self.responses_reported += 1
+                    else:
+                        self.failures += 1
+                    self._condition.notify_all()
+
+    def _send(self, response):
+        delay = self.retry_delay
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.worker.send_response(response)
+                return True
+            except self.retry_errors as err:
+                if attempt == self.max_retries:
+                    self._handle_exception(err)
+                    return False
+                log.debug("Reporting %s was throttled (%r), retrying in %.2fs",
+                          response[0], err, delay)
+                with self._condition:
+                    self.retries += 1
+                time.sleep(delay)
+                delay *= 2
+            except UnknownResourceError as err:
+                # the task timed out or was canceled in the meantime
+                log.warning("Could not report %s: %r", response[0], err)
+                return False
+            except Exception as err:
+                self._handle_exception(err)
+                return False
+
+    def _handle_exception(self, err):
+        _, _, tb = sys.exc_info()
+        tb_list = traceback.extract_tb(tb)
+        handler = self.worker.unhandled_exception_handler
+        handler(err, tb_list)
@@ -0,0 +1,198 @@
+# Copyright 2013 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://aws.amazon.com/apache2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+"""
+Background heartbeating of the activity tasks (see
+:py:attr:`~botoflow.workers.activity_worker.ActivityWorker.background_heartbeats`).
+"""
+
+import time
+import threading
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class _HeartbeatState(object):
+    """Heartbeat bookkeeping of a single activity task"""
+
+    __slots__ = ('task', 'interval', 'details', 'pending', 'last_sent', 'cancel_requested')
+
+    def __init__(self, task, interval):
+        self.task = task
+        self.interval = interval
+        self.details = None
+        self.pending = False
+        self.last_sent = None
+        self.cancel_requested = False
+
+    @property
+    def due_time(self):
+        if self.last_sent is None:
+            return 0
+        return self.last_sent + self.interval
+
+
+class HeartbeatManager(object):
+    """Records the heartbeats of the activity tasks of a worker from a
+    background thread, so heartbeating never blocks the activity.
+
+    The details of the heartbeats made in between two recorded heartbeats
+    are coalesced, only the latest ones are sent. The first heartbeat of a
+    task is sent right away, the following ones at most once per interval,
+    which is a *timeout_ratio* of the heartbeat timeout of the activity (or
+    *max_interval* seconds if it's shorter or the activity has no heartbeat
+    timeout).
+
+    Whether the cancel of the task was requested is remembered from the
+    recorded heartbeats and returned by :py:meth:`heartbeat`, so the
+    cancellation is noticed on the first heartbeat after it was recorded.
+
+    :param worker: the worker to record the heartbeats with
+    :type worker: botoflow.workers.activity_worker.ActivityWorker
+    :param float max_interval: Maximum seconds between two heartbeats of a task.
+    :param float timeout_ratio: Ratio of the heartbeat timeout to use as the
+        heartbeat interval.
+    """
+
+    def __init__(self, worker, max_interval=30.0, timeout_ratio=0.5):
+        self.worker = worker
+        self.max_interval = max_interval
+        self.timeout_ratio = timeout_ratio
+
+        self._condition = threading.Condition()
+        self._states = dict()
+        self._thread = None
+        self._stopped = False
+
+        self.heartbeats_requested = 0
+        self.heartbeats_sent = 0
+
+    def __getstate__(self):
+        return {'worker': self.worker,
+                'max_interval': self.max_interval,
+                'timeout_ratio': self.timeout_ratio}
+
+    def __setstate__(self, dct):
+        self.__init__(**dct)
+
+    def interval(self, heartbeat_timeout):
+        """Returns the seconds between two heartbeats of an activity with
+        *heartbeat_timeout*
+
+        :param heartbeat_timeout: seconds or None (or 'NONE') for no timeout
+        """
+        try:
+            timeout = float(heartbeat_timeout)
+        except (TypeError, ValueError):
+            return self.max_interval
+        return min(self.max_interval, timeout * self.timeout_ratio)
+
+    def heartbeat(self, task, details=None, heartbeat_timeout=None):
+        """Schedules a heartbeat of *task* without blocking.
+
+        :type task: botoflow.workers.activity_task.ActivityTask
+        :param details: If specified, contains details about the progress of the task.
+        :param heartbeat_timeout: heartbeat timeout of the activity
+        :returns: True if any of the recorded heartbeats returned that the
+            cancel of the task was requested
+        :rtype: bool
+        """
+        with self._condition:
+            state = self._states.get(task.token)
+            if state is None:
+                state = _HeartbeatState(task, self.interval(heartbeat_timeout))
+                self._states[task.token] = state
+
+            self.heartbeats_requested += 1
+            state.details = details
+            state.pending = True
+            self._ensure_started()
+            self._condition.notify()
+            return state.cancel_requested
+
+    def discard(self, task):
+        """Forgets *task* and drops its heartbeat, if not sent yet. Called
+        once the task is finished.
+        """
+        with self._condition:
+            self._states.pop(task.token, None)
+
+    def stop(self):
+        """Stops the background thread, the pending heartbeats are dropped"""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+            thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def stats(self):
+        """Returns a dict of the count of the tasks heartbeating and of the
+        heartbeats requested by the activities and actually sent to SWF.
+        """
+        with self._condition:
+            return {'tasks': len(self._states),
+                    'heartbeats_requested': self.heartbeats_requested,
+                    'heartbeats_sent': self.heartbeats_sent}
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run,
+                                        name="%r HeartbeatManager" % self.worker)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _next_due(self):
+        """Returns the states of the heartbeats to send now and the seconds
+        until the next one is due (None if nothing is pending)
+        """
+        now = time.time()
+        due, wait = [], None
+        for state in self._states.values():
+            if not state.pending:
+                continue
+            delay = state.due_time - now
+            if delay <= 0:
+                due.append((state, state.details))
+                state.pending = False
+                state.last_sent = now
+            elif wait is None or delay < wait:
+                wait = delay
+        return due, wait
+
+    def _run(self):
+        while True:
+            with self._condition:
+                due, wait = self._next_due()
+                while not due and not self._stopped:
+                    self._condition.wait(wait)
+                    due, wait = self._next_due()
+                if self._stopped:
+                    return
+
+            for state, details in due:
+                self._send(state, details)
+
+    def _send(self, state, details):
+        try:
+            result = self.worker.request_heartbeat(state.task, details)
+        except Exception as err:
+            log.warning("Heartbeat of activity %s failed: %r", state.task.id, err)
+            return
+
+        with self._condition:
+            self.heartbeats_sent += 1
+            if result['cancelRequested']:
+                state.cancel_requested = True
@@ -24,6 +24,53 @@ from .multiprocessing_executor import MultiprocessingExecutor
 log = logging.getLogger(__name__)
 
 
+def _handle_exception(executor, err):
+    _, _, tb = sys.exc_info()
+    tb_list = traceback.extract_tb(tb)
+    handler = executor._worker.unhandled_exception_handler
+    handler(err, tb_list)
+
+
+def _run_poller_worker(executor, poller_semaphore):
+    process = multiprocessing.current_process()
+    log.debug("Poller/executor %s started", process.name)
+    initializer = executor.initializer
+    initializer(executor)
+    while not executor._shutting_down:
+        work_callable = None
+        with poller_semaphore:
+
+            while work_callable is None:
+                # make sure that after we wake up we're still relevant
+                if executor._shutting_down:
+                    return
+                try:
+                    work_callable = executor._worker.poll_for_activities()
+                except Exception as err:
+                    _handle_exception(executor, err)
+
+        try:
+            work_callable()
+        except Exception as err:
+            _handle_exception(executor, err)
+
+
+def _run_poller_worker_with_exc(executor_pickle, process_state, poller_semaphore):
+    executor = dill.loads(executor_pickle)
+    executor._attach_process_state(process_state)
+    try:
+        # ignore any SIGINT, so it looks closer to threading
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        _run_poller_worker(executor, poller_semaphore)
+    except Exception as err:
+        _handle_exception(executor, err)
+    finally:
+        # the process exits once this returns, report everything queued
+        executor._worker.flush_responses()
+        process = multiprocessing.current_process()
+        log.debug("Poller/executor %s terminating", process.name)
+
+
 class MultiprocessingActivityExecutor(MultiprocessingExecutor):
     """This is an executor for :py:class:`~.ActivityWorker` that uses multiple processes to
     parallelize the activity work.
@@ -48,58 +95,8 @@ class MultiprocessingActivityExecutor(MultiprocessingExecutor):
         super(MultiprocessingActivityExecutor, self).start()
 
         # we use this semaphore to ensure we have at most poller_tasks running
-        poller_semaphore = self._process_manager().Semaphore(pollers)
-
-        def run_poller_worker_with_exc(executor_pickle):
-            executor = dill.loads(executor_pickle)
-            try:
-                executor._process_queue.get()
-                # ignore any SIGINT, so it looks closer to threading
-                signal.signal(signal.SIGINT, signal.SIG_IGN)
-                run_poller_worker(executor)
-            except Exception as err:
-                _, _, tb = sys.exc_info()
-                tb_list = traceback.extract_tb(tb)
-                handler = executor._worker.unhandled_exception_handler
-                handler(err, tb_list)
-            finally:
-                process = multiprocessing.current_process()
-                log.debug("Poller/executor %s terminating", process.name)
-                executor._process_queue.task_done()
-
-        def run_poller_worker(executor):
-            process = multiprocessing.current_process()
-            log.debug("Poller/executor %s started", process.name)
-            initializer = self.initializer
-            initializer(executor)
-            while executor._worker_shutdown.empty():
-                work_callable = None
-                with poller_semaphore:
-
-                    while work_callable is None:
-                        # make sure that after we wake up we're still relevant
-                        if not executor._worker_shutdown.empty():
-                            return
-                        try:
-                            work_callable = executor._worker.poll_for_activities()
-                        except Exception as err:
-                            _, _, tb = sys.exc_info()
-                            tb_list = traceback.extract_tb(tb)
-                            handler = executor._worker.unhandled_exception_handler
-                            handler(err, tb_list)
-
-                try:
-                    work_callable()
-                except Exception as err:
-                    _, _, tb = sys.exc_info()
-                    tb_list = traceback.extract_tb(tb)
-                    handler = executor._worker.unhandled_exception_handler
-                    handler(err, tb_list)
+        poller_semaphore = multiprocessing.Semaphore(pollers)
 
         for i in range(workers):
-            process = multiprocessing.Process(
-                target=run_poller_worker_with_exc, args=(dill.dumps(self),))
-            self._process_queue.put(i)
-            process.daemon = True
-            process.name = "%r Process-%d" % (self, i)
-            process.start()
+            self._start_process(_run_poller_worker_with_exc, "%r Process-%d" % (self, i),
+                                poller_semaphore)
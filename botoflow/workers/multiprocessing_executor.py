@@ -12,37 +12,59 @@
 # permissions and limitations under the License.
 
 import sys
+import time
 import multiprocessing
-import multiprocessing.managers
-import signal
 import logging
 
+from copy import copy
+
+import dill
 import six
 
 
 log = logging.getLogger(__name__)
 
 
-def _manager_initializer():
-    signal.signal(signal.SIGINT, signal.SIG_IGN)
+class SharedTaskCounter(object):
+    """:py:class:`~botoflow.workers.base_worker.TaskCounter` shared by all
+    the worker processes, backed by shared memory.
+
+    Like the other multiprocessing primitives, it can only be passed to a
+    process on its start, it is detached when pickled otherwise.
+    """
+
+    def __init__(self, value=None):
+        if value is None:
+            value = multiprocessing.Value('i', 0)
+        self.shared_value = value
+
+    @property
+    def value(self):
+        return self.shared_value.value
 
+    def __enter__(self):
+        with self.shared_value.get_lock():
+            self.shared_value.value += 1
+        return self
 
-class _ProcessManager(object):
-    def __init__(self):
-        self._process_manager = None
+    def __exit__(self, exc_type, err, tb):
+        with self.shared_value.get_lock():
+            self.shared_value.value -= 1
 
-    def process_manager(self):
-        if self._process_manager is None:
-            self._process_manager = multiprocessing.managers.SyncManager()
-            self._process_manager.start(_manager_initializer)
-        return self._process_manager
+    def __getstate__(self):
+        return {}
 
-process_manager = _ProcessManager().process_manager
+    def __setstate__(self, dct):
+        # reattached by MultiprocessingExecutor._attach_process_state
+        self.shared_value = None
 
 
 class MultiprocessingExecutor(object):
     """A base for all multiprocessing executors"""
 
+    # how often (in seconds) drain checks for the tasks in progress
+    _drain_check_interval = 0.1
+
     def __init__(self, worker):
         self._worker = worker
 
@@ -50,12 +72,45 @@ class MultiprocessingExecutor(object):
         """Start the worker. This method does not block."""
         log.debug("Starting worker %s", self)
 
-        # use this simple queue (and .empty) to check if we should shut down
-        self._worker_shutdown = self._process_manager().Queue()
-        # to track the active processes
-        self._process_queue = self._process_manager().JoinableQueue()
+        # set when the processes should shut down
+        self._worker_shutdown = multiprocessing.Event()
+        # count the tasks in progress in all the processes, for drain()
+        self._worker.tasks_in_progress = SharedTaskCounter()
+        # the started processes
+        self._processes = list()
         self._running = True
 
+    def __getstate__(self):
+        # the multiprocessing primitives can't be pickled, they are passed
+        # to the processes as arguments instead (see _start_process)
+        dct = copy(self.__dict__)
+        dct.pop('_worker_shutdown', None)
+        dct.pop('_processes', None)
+        return dct
+
+    def _start_process(self, target, name, *args):
+        """Starts a daemonic process running *target*, which gets the pickled
+        executor, the state to pass to :py:meth:`_attach_process_state` and
+        *args* as arguments.
+        """
+        process_state = (self._worker_shutdown, self._worker.tasks_in_progress.shared_value)
+        process = multiprocessing.Process(target=target,
+                                          args=(dill.dumps(self), process_state) + args)
+        process.daemon = True
+        process.name = name
+        process.start()
+        self._processes.append(process)
+        return process
+
+    def _attach_process_state(self, process_state):
+        """Called in the started process to attach the shared state"""
+        self._worker_shutdown, tasks_in_progress = process_state
+        self._worker.tasks_in_progress = SharedTaskCounter(tasks_in_progress)
+
+    @property
+    def _shutting_down(self):
+        return self._worker_shutdown.is_set()
+
     def stop(self):
         """Stops the worker processes.
         To wait for all the processes to terminate, call:
@@ -72,16 +127,50 @@ class MultiprocessingExecutor(object):
         if not self.is_running:
             return False
 
-        self._worker_shutdown.put(1)
+        self._worker_shutdown.set()
+
+    def drain(self, timeout=None):
+        """Stops polling for new tasks and waits for the tasks in progress to
+        finish, for rolling deploys and such:
+
+        .. code-block:: python
+
+            if not worker.drain(timeout=30):
+                log.warning("Some tasks did not finish in time")
+            sys.exit()
+
+        Unlike :py:meth:`join`, this does not wait for the long polls in
+        progress, which can take over a minute to return. The worker
+        processes are daemonic, so they are terminated (abandoning their
+        polls) once the main process exits. SWF times out a task handed to
+        an abandoned poll and schedules it again (or fails it, for activity
+        tasks), so nothing is lost.
+
+        :param float timeout: Maximum seconds to wait, forever if None.
+        :returns: True if all the tasks in progress finished in time
+        :rtype: bool
+        """
+        self.stop()
+        deadline = None
+        if timeout is not None:
+            deadline = time.time() + timeout
+
+        while self._worker.tasks_in_progress.value:
+            if deadline is not None and time.time() >= deadline:
+                return False
+            time.sleep(self._drain_check_interval)
+        return True
 
     def join(self):
         """Will wait till all the processes are terminated
         """
         try:
-            self._process_queue.join()
+            for process in self._processes:
+                process.join()
         except KeyboardInterrupt:
             six.print_("\nTerminating, please wait...", file=sys.stderr)
-            self._process_queue.join()
+            for process in self._processes:
+                process.join()
         self._running = False
 
     @property
@@ -121,7 +210,3 @@ class MultiprocessingExecutor(object):
         if hasattr(self, '_running'):
             return self._running
         return False
-
-    @classmethod
-    def _process_manager(cls):
-        return process_manager()
@@ -12,7 +12,6 @@
 # permissions and limitations under the License.
 
 import multiprocessing
-import multiprocessing.queues
 import signal
 import logging
 
@@ -25,6 +24,41 @@ from .multiprocessing_executor import MultiprocessingExecutor
 log = logging.getLogger(__name__)
 
 
+def _run_decider(executor, start_condition):
+    # ignore any SIGINT, so it looks closer to threading
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    process = multiprocessing.current_process()
+    log.debug("Poller/decider %s started", process.name)
+
+    while not executor._shutting_down:
+        with start_condition:
+            start_condition.notify_all()
+        try:
+            executor._worker.run_once()
+
+        except Exception as err:
+            tb_list = async_traceback.extract_tb()
+            handler = executor._worker.unhandled_exception_handler
+            handler(err, tb_list)
+
+
+def _run_decider_with_exc(executor_pickle, process_state, start_condition):
+    executor = dill.loads(executor_pickle)
+    executor._attach_process_state(process_state)
+    initializer = executor.initializer
+    initializer(executor)
+    try:
+        _run_decider(executor, start_condition)
+    except Exception as err:
+        tb_list = async_traceback.extract_tb()
+        handler = executor._worker.unhandled_exception_handler
+        handler(err, tb_list)
+    finally:
+        process = multiprocessing.current_process()
+        log.debug("Poller/decider %s terminating", process.name)
+
+
 class MultiprocessingWorkflowExecutor(MultiprocessingExecutor):
     """This is a multiprocessing workflow executor, suitable for handling lots of
     workflow decisions in parallel on CPython.
@@ -52,50 +86,12 @@ class MultiprocessingWorkflowExecutor(MultiprocessingExecutor):
 
         super(MultiprocessingWorkflowExecutor, self).start()
 
-        start_condition = self._process_manager().Condition()
-
-        def run_decider(executor):
-            executor._process_queue.get()
-            # ignore any SIGINT, so it looks closer to threading
-            signal.signal(signal.SIGINT, signal.SIG_IGN)
-
-            process = multiprocessing.current_process()
-            log.debug("Poller/decider %s started", process.name)
-
-            while executor._worker_shutdown.empty():
-                with start_condition:
-                    start_condition.notify_all()
-                try:
-                    executor._worker.run_once()
-
-                except Exception as err:
-                    tb_list = async_traceback.extract_tb()
-                    handler = executor._worker.unhandled_exception_handler
-                    handler(err, tb_list)
-
-        def run_decider_with_exc(executor_pickle):
-            executor = dill.loads(executor_pickle)
-            initializer = self.initializer
-            initializer(executor)
-            try:
-                run_decider(executor)
-            except Exception as err:
-                tb_list = async_traceback.extract_tb()
-                handler = executor._worker.unhandled_exception_handler
-                handler(err, tb_list)
-            finally:
-                process = multiprocessing.current_process()
-                log.debug("Poller/decider %s terminating", process.name)
-                executor._process_queue.task_done()
+        start_condition = multiprocessing.Condition()
 
         for i in range(pollers):
             with start_condition:
-                self._process_queue.put(i)
-                process = multiprocessing.Process(target=run_decider_with_exc,
-                                                  args=(dill.dumps(self),))
-                process.daemon = True
-                process.name = "%r Process-%d" % (self, i)
-                process.start()
+                self._start_process(_run_decider_with_exc, "%r Process-%d" % (self, i),
+                                    start_condition)
                 # wait for the process to "ready" before starting next one
                 # or returning
                 start_condition.wait()
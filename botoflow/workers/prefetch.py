@@ -0,0 +1,95 @@
+# Copyright 2013 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://aws.amazon.com/apache2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+"""
+Prefetching of activity tasks by the pollers of the activity executors (see
+:py:class:`~botoflow.workers.threaded_activity_executor.ThreadedActivityExecutor`).
+"""
+
+import math
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class PrefetchPolicy(object):
+    """Decides how many polled activity tasks the executor keeps buffered
+    for its workers.
+
+    For very short activities the workers would mostly wait for the polls,
+    so the pollers poll ahead and keep a buffer of tasks. The size of the
+    buffer is the count of tasks the workers process while a poll is in
+    progress (the processing rate times the poll latency, as observed by
+    the executor), within 1 and *max_buffer*.
+
+    The ``start_to_close_timeout`` of an activity task runs from the moment
+    it's polled, so the time spent in the buffer eats into it. The buffer is
+    kept small enough for the tasks to wait at most a *timeout_ratio* of the
+    shortest ``start_to_close_timeout`` seen, and the tasks that waited past
+    their timeout are dropped without running them (SWF has timed them out
+    already). The ``schedule_to_start_timeout`` stops counting once a task is
+    polled, so it's not affected by the buffering.
+
+    Only the registered default timeouts of the activity types are known to
+    the worker, the timeouts overridden when scheduling the activity are
+    not.
+
+    :param int max_buffer: Maximum count of tasks buffered (and being
+        polled for).
+    :param float timeout_ratio: Ratio of the ``start_to_close_timeout`` a
+        task may spend in the buffer.
+    """
+
+    def __init__(self, max_buffer=10, timeout_ratio=0.5):
+        if max_buffer < 1:
+            raise ValueError("max_buffer must be greater than 0")
+        if not 0 < timeout_ratio <= 1:
+            raise ValueError("must be 0 < timeout_ratio <= 1")
+
+        self.max_buffer = max_buffer
+        self.timeout_ratio = timeout_ratio
+
+    @staticmethod
+    def timeout(activity_type):
+        """Returns the ``start_to_close_timeout`` of the *activity_type* in
+        seconds, or None if it has none
+        """
+        try:
+            return float(activity_type.start_to_close_timeout)
+        except (TypeError, ValueError):
+            return None
+
+    def max_wait(self, activity_type):
+        """Returns the seconds a task of *activity_type* may wait in the
+        buffer, or None if unbounded
+        """
+        timeout = self.timeout(activity_type)
+        if timeout is None:
+            return None
+        return timeout * self.timeout_ratio
+
+    def buffer_size(self, throughput, poll_latency, max_wait=None):
+        """Returns the count of tasks to buffer
+
+        :param float throughput: Tasks per second the workers can process.
+        :param float poll_latency: Average seconds of a poll that returned a task.
+        :param float max_wait: Seconds the tasks may wait in the buffer,
+            unbounded if None.
+        :rtype: int
+        """
+        if throughput <= 0:
+            return 1
+
+        size = int(math.ceil(throughput * poll_latency))
+        if max_wait is not None:
+            size = min(size, int(throughput * max_wait))
+        return min(max(size, 1), self.max_buffer)
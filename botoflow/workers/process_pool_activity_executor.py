@@ -0,0 +1,169 @@
+# Copyright 2013 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://aws.amazon.com/apache2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import sys
+import signal
+import threading
+import functools
+import traceback
+import multiprocessing
+import logging
+
+import dill
+
+from .threaded_activity_executor import ThreadedActivityExecutor
+
+log = logging.getLogger(__name__)
+
+
+def _request_heartbeat(conn, task, details=None):
+    # heartbeats are relayed to the parent process, which records them
+    conn.send(('heartbeat', details))
+    status, result = conn.recv()
+    if status == 'error':
+        raise result
+    return result
+
+
+def _run_worker_process(worker_pickle, initializer_pickle, conn):
+    # ignore any SIGINT, so it looks closer to threading
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    worker = dill.loads(worker_pickle)
+    # the parent process does the background heartbeating, if enabled
+    worker.background_heartbeats = False
+    worker.request_heartbeat = functools.partial(_request_heartbeat, conn)
+    dill.loads(initializer_pickle)(worker)
+
+    process = multiprocessing.current_process()
+    log.debug("Worker process %s started", process.name)
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:  # shutdown
+            break
+
+        response = None
+        try:
+            response = worker.execute_activity_task(task)
+        except Exception as err:
+            _, _, tb = sys.exc_info()
+            tb_list = traceback.extract_tb(tb)
+            handler = worker.unhandled_exception_handler
+            handler(err, tb_list)
+        conn.send(('done', response))
+    log.debug("Worker process %s terminating", process.name)
+
+
+class ProcessPoolActivityExecutor(ThreadedActivityExecutor):
+    """This is an executor for :py:class:`~.ActivityWorker` that runs the
+    activities in a pool of long-lived worker processes.
+
+    Unlike the :py:class:`~.MultiprocessingActivityExecutor`, the worker
+    processes neither poll nor talk to SWF. The polling is done by a few
+    poller threads in the parent process (see
+    :py:class:`~.ThreadedActivityExecutor`), which hand the tasks to idle
+    worker processes over pipes. The worker processes send the heartbeats
+    and the results back to the parent process, which reports them to SWF.
+    This keeps the count of long-poll connections low, while CPU-bound
+    activities can use all the cores.
+
+    .. code-block:: python
+
+        executor = ProcessPoolActivityExecutor(ActivityWorker(
+            session, 'us-east-1', 'SOMEDOMAIN', 'MYTASKLIST', MyActivities()))
+        executor.start(pollers=2, workers=multiprocessing.cpu_count())
+
+    The worker processes are started once and reused, so any expensive setup
+    can be done in the :py:attr:`initializer`, which is called in every
+    worker process with the worker object as the first argument.
+    """
+
+    def start(self, pollers=1, workers=1, queue_size=None):
+        """Start the worker. This method does not block.
+
+        :param int pollers: Count of poller threads to use.
+        :param int workers: Count of worker processes to use.
+        :param int queue_size: Maximum count of polled tasks waiting for a
+            worker process. Defaults to the count of *pollers*.
+        """
+        self._local = threading.local()
+        super(ProcessPoolActivityExecutor, self).start(pollers, workers, queue_size)
+
+    def _start_process(self):
+        parent_conn, child_conn = multiprocessing.Pipe()
+        process = multiprocessing.Process(
+            target=_run_worker_process,
+            args=(dill.dumps(self._worker), dill.dumps(self.initializer), child_conn))
+        process.daemon = True
+        process.name = "%r Process-%s" % (self, threading.current_thread().name)
+        process.start()
+        child_conn.close()
+
+        self._local.process = process
+        self._local.conn = parent_conn
+
+    def _stop_process(self):
+        process, conn = self._local.process, self._local.conn
+        self._local.process = self._local.conn = None
+        try:
+            conn.send(None)
+        except (IOError, OSError):  # already dead
+            pass
+        conn.close()
+        process.join()
+
+    def _worker_loop(self):
+        self._start_process()
+        try:
+            super(ProcessPoolActivityExecutor, self)._worker_loop()
+        finally:
+            self._stop_process()
+
+    def _process_task(self, task):
+        conn = self._local.conn
+        try:
+            conn.send(task)
+            while True:
+                message, value = conn.recv()
+                if message == 'done':
+                    break
+                self._relay_heartbeat(conn, task, value)
+        except EOFError:
+            # the process died, replace it with a fresh one
+            log.warning("Worker process %s died while running %s",
+                        self._local.process.name, task.name)
+            self._stop_process()
+            self._start_process()
+            raise
+        finally:
+            if self._worker.heartbeat_manager is not None:
+                self._worker.heartbeat_manager.discard(task)
+
+        self._worker.respond(value)
+
+    def _relay_heartbeat(self, conn, task, details):
+        heartbeat_manager = self._worker.heartbeat_manager
+        try:
+            if heartbeat_manager is not None:
+                _, activity_type = self._worker.get_activity(task)
+                result = {'cancelRequested': heartbeat_manager.heartbeat(
+                    task, details, activity_type.heartbeat_timeout)}
+            else:
+                result = self._worker.request_heartbeat(task, details)
+        except Exception as err:
+            conn.send(('error', err))
+        else:
+            conn.send(('ok', result))
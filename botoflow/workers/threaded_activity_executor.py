@@ -12,11 +12,16 @@
 # permissions and limitations under the License.
 
 import sys
+import time
+import itertools
 import threading
 import traceback
 import logging
 
+from six.moves import queue
+
 from .threaded_executor import ThreadedExecutor
+from .autoscaling import Autoscaler
 
 log = logging.getLogger(__name__)
 
@@ -25,61 +30,368 @@ class ThreadedActivityExecutor (ThreadedExecutor):
     """This is an executor for :py:class:`~.ActivityWorker` that uses threads to parallelize
     the activity work.
 
+    The work is split into a pipeline: dedicated poller threads long-poll
+    for activity tasks and put them into a bounded queue, from which a pool
+    of worker threads takes them and runs the activities. A poll is only
+    started when there's room in the queue for the task, so the pollers
+    pause when the workers fall behind. Use :py:meth:`stats` to see how
+    deep the queue is and how busy the workers are.
+
+    The count of pollers and workers can be changed while running with
+    :py:meth:`resize`, or adjusted automatically to the load by passing an
+    :py:class:`~botoflow.workers.autoscaling.AutoscalingPolicy` to
+    :py:meth:`start`.
+
+    For very short activities, the pollers can poll ahead and keep a small
+    buffer of tasks sized by the observed processing rate, by passing a
+    :py:class:`~botoflow.workers.prefetch.PrefetchPolicy` to :py:meth:`start`.
+
     Because of the GIL in CPython, it is recomended to use this worker only on
     Jython or IronPython.
     """
 
-    def start(self, pollers=1, workers=1):
+    # how often (in seconds) idle worker threads check for shutdown
+    _shutdown_check_interval = 0.5
+
+    def start(self, pollers=1, workers=1, queue_size=None, autoscaling=None, prefetch=None):
         """Start the worker. This method does not block.
 
-        :param int pollers: Count of poller threads to use. Must be equal or
-            less than the `workers` attribute.
+        :param int pollers: Count of poller threads to use.
         :param int workers: Count of worker threads to use.
+        :param int queue_size: Maximum count of polled tasks waiting for a
+            worker. Defaults to the count of *pollers* (or the maximum count
+            of pollers when autoscaling, or the maximum buffer size when
+            prefetching).
+        :param autoscaling: If set, the count of pollers and workers is
+            adjusted to the load within the bounds of the policy, starting
+            from *pollers* and *workers*.
+        :type autoscaling: botoflow.workers.autoscaling.AutoscalingPolicy
+        :param prefetch: If set, the pollers keep a buffer of polled tasks
+            sized according to the policy (and at most *queue_size*).
+        :type prefetch: botoflow.workers.prefetch.PrefetchPolicy
         """
         if pollers < 1:
             raise ValueError("poller_threads count must be greater than 0")
         if workers < 1:
             raise ValueError("worker_threads count must be greater than 0")
-        if pollers > workers:
-            raise ValueError("poller_thread must be less or equal to "
-                             "worker_threads")
+        if autoscaling is not None:
+            pollers, workers = autoscaling.clamp(pollers, workers)
+        if queue_size is None:
+            if prefetch is not None:
+                queue_size = prefetch.max_buffer
+            elif autoscaling is not None:
+                queue_size = autoscaling.max_pollers
+            else:
+                queue_size = pollers
+        if queue_size < 1:
+            raise ValueError("queue_size must be greater than 0")
 
         super(ThreadedActivityExecutor, self).start()
 
-        # we use this semaphore to ensure we have at most poller_tasks running
-        poller_semaphore = threading.Semaphore(pollers)
-
-        # noinspection PyShadowingNames
-        def run_poller_worker(self):
-            self._thread_queue.get()
-            # noinspection PyShadowingNames
-            thread = threading.current_thread()
-            log.debug("Poller/worker %s started", thread.name)
-            try:
-                while not self._worker_shutdown:
-                    work_callable = None
-                    with poller_semaphore:
-
-                        while work_callable is None:
-                            # make sure that after we wake up we're still
-                            # relevant
-                            if self._worker_shutdown:
-                                return
-                            work_callable = self._worker.poll_for_activities()
-                    work_callable()
-
-            except Exception as err:
-                _, _, tb = sys.exc_info()
-                tb_list = traceback.extract_tb(tb)
-                handler = self._worker.unhandled_exception_handler
-                handler(err, tb_list)
-            finally:
-                log.debug("Poller/worker %s terminating", thread.name)
-                self._thread_queue.task_done()
-
-        for i in range(workers):
-            self._thread_queue.put(i)
-            thread = threading.Thread(target=run_poller_worker, args=(self,))
-            thread.daemon = True
-            thread.name = "%r Thread-%d" % (self, i)
-            thread.start()
+        self._pollers = 0
+        self._workers = 0
+        self._queue_size = queue_size
+        self._task_queue = queue.Queue()
+        # free places in the task queue, taken by the pollers before polling
+        self._queue_slots = threading.Semaphore(queue_size)
+
+        self._stats_lock = threading.Lock()
+        # notified when a task is taken from the queue, for the prefetching pollers
+        self._buffer_changed = threading.Condition(self._stats_lock)
+        self._prefetch = prefetch
+        self._polls_in_flight = 0
+        self._poll_time = 0.0
+        self._max_wait = None
+        self._expired_tasks = 0
+        self._poller_ids = itertools.count()
+        self._worker_ids = itertools.count()
+        self._active_pollers = 0
+        self._active_workers = 0
+        self._busy_workers = 0
+        self._tasks_polled = 0
+        self._empty_polls = 0
+        self._tasks_started = 0
+        self._tasks_processed = 0
+        self._queue_wait_time = 0.0
+        self._busy_time = 0.0
+
+        self._autoscaler = None
+        if autoscaling is not None:
+            self._autoscaler = Autoscaler(self, autoscaling)
+
+        # the pollers and the workers use the worker's client at the same time
+        if autoscaling is not None:
+            self._worker._reserve_connections(autoscaling.max_pollers + autoscaling.max_workers)
+        else:
+            self._worker._reserve_connections(pollers + workers)
+
+        self.resize(pollers, workers)
+
+        if self._autoscaler is not None:
+            self._autoscaler.start()
+
+    def resize(self, pollers=None, workers=None):
+        """Changes the count of poller and/or worker threads. New threads
+        are started right away, the threads over the count terminate after
+        their current poll or task.
+
+        :param int pollers: New count of poller threads.
+        :param int workers: New count of worker threads.
+        """
+        if pollers is not None and pollers < 1:
+            raise ValueError("poller_threads count must be greater than 0")
+        if workers is not None and workers < 1:
+            raise ValueError("worker_threads count must be greater than 0")
+
+        with self._stats_lock:
+            if self._worker_shutdown:
+                return
+            if pollers is not None:
+                self._pollers = pollers
+            if workers is not None:
+                self._workers = workers
+
+            new_pollers = max(self._pollers - self._active_pollers, 0)
+            new_workers = max(self._workers - self._active_workers, 0)
+            self._active_pollers += new_pollers
+            self._active_workers += new_workers
+
+        for _ in range(new_pollers):
+            self._start_thread(self._run_poller, "Poller-%d" % next(self._poller_ids))
+        for _ in range(new_workers):
+            self._start_thread(self._run_worker, "Thread-%d" % next(self._worker_ids))
+
+    def _start_thread(self, target, name):
+        self._thread_queue.put(name)
+        thread = threading.Thread(target=target)
+        thread.daemon = True
+        thread.name = "%r %s" % (self, name)
+        thread.start()
+
+    def stop(self):
+        if super(ThreadedActivityExecutor, self).stop() is False:
+            return False
+
+        if self._autoscaler is not None:
+            self._autoscaler.stop()
+
+        # wake up the pollers waiting for room in the queue
+        with self._stats_lock:
+            active_pollers = self._active_pollers
+        for _ in range(active_pollers):
+            self._queue_slots.release()
+
+    def _handle_exception(self, err):
+        _, _, tb = sys.exc_info()
+        tb_list = traceback.extract_tb(tb)
+        handler = self._worker.unhandled_exception_handler
+        handler(err, tb_list)
+
+    def _retire_poller(self):
+        # called with the _stats_lock held
+        if self._active_pollers > self._pollers:
+            self._active_pollers -= 1
+            return True
+        return False
+
+    def _retire_worker(self):
+        # called with the _stats_lock held
+        if self._active_workers > self._workers:
+            self._active_workers -= 1
+            return True
+        return False
+
+    def _run_poller(self):
+        thread = threading.current_thread()
+        log.debug("Poller %s started", thread.name)
+        retired = False
+        try:
+            while not self._worker_shutdown:
+                with self._stats_lock:
+                    retired = self._retire_poller()
+                if retired:
+                    return
+
+                self._queue_slots.acquire()
+                # make sure that after we wake up we're still relevant
+                if self._worker_shutdown:
+                    return
+
+                with self._buffer_changed:
+                    if self._prefetch is not None:
+                        self._wait_for_buffer_room()
+                    self._polls_in_flight += 1
+
+                task = None
+                poll_time = time.time()
+                try:
+                    task = self._worker.poll_for_activity_task()
+                except Exception as err:
+                    self._handle_exception(err)
+
+                if task is None:
+                    with self._stats_lock:
+                        self._polls_in_flight -= 1
+                        self._empty_polls += 1
+                    self._queue_slots.release()
+                    continue
+
+                max_wait = None
+                if self._prefetch is not None:
+                    max_wait = self._max_task_wait(task)
+
+                with self._stats_lock:
+                    self._polls_in_flight -= 1
+                    self._tasks_polled += 1
+                    self._poll_time += time.time() - poll_time
+                    if max_wait is not None and (self._max_wait is None or max_wait < self._max_wait):
+                        self._max_wait = max_wait
+                # the task is queued even when shutting down, the workers
+                # finish all queued tasks before terminating
+                self._task_queue.put((time.time(), task))
+        finally:
+            log.debug("Poller %s terminating", thread.name)
+            if not retired:
+                with self._stats_lock:
+                    self._active_pollers -= 1
+            self._thread_queue.task_done()
+
+    def _run_worker(self):
+        thread = threading.current_thread()
+        log.debug("Worker %s started", thread.name)
+        try:
+            self._worker_loop()
+        finally:
+            log.debug("Worker %s terminating", thread.name)
+            self._thread_queue.task_done()
+
+    def _worker_loop(self):
+        retired = False
+        try:
+            while True:
+                with self._stats_lock:
+                    retired = self._retire_worker()
+                if retired:
+                    return
+
+                try:
+                    queued_time, task = self._task_queue.get(
+                        timeout=self._shutdown_check_interval)
+                except queue.Empty:
+                    if self._worker_shutdown and not self._active_pollers:
+                        return
+                    continue
+
+                self._queue_slots.release()
+                started_time = time.time()
+                if self._prefetch is not None and self._task_expired(task, started_time - queued_time):
+                    with self._buffer_changed:
+                        self._expired_tasks += 1
+                        self._tasks_processed += 1
+                        self._buffer_changed.notify_all()
+                    continue
+
+                with self._buffer_changed:
+                    self._buffer_changed.notify_all()
+                    self._busy_workers += 1
+                    self._tasks_started += 1
+                    self._queue_wait_time += started_time - queued_time
+                try:
+                    self._process_task(task)
+                except Exception as err:
+                    self._handle_exception(err)
+                finally:
+                    with self._stats_lock:
+                        self._busy_workers -= 1
+                        self._tasks_processed += 1
+                        self._busy_time += time.time() - started_time
+        finally:
+            if not retired:
+                with self._stats_lock:
+                    self._active_workers -= 1
+
+    def _buffer_size(self):
+        # called with the _stats_lock held
+        throughput = poll_latency = 0.0
+        if self._tasks_processed and self._busy_time > 0:
+            throughput = self._workers * self._tasks_processed / self._busy_time
+        if self._tasks_polled:
+            poll_latency = self._poll_time / self._tasks_polled
+        return self._prefetch.buffer_size(throughput, poll_latency, self._max_wait)
+
+    def _wait_for_buffer_room(self):
+        # called with the _buffer_changed condition held, the tasks being
+        # polled for count as buffered too
+        while (not self._worker_shutdown and
+               self._task_queue.qsize() + self._polls_in_flight >= self._buffer_size()):
+            self._buffer_changed.wait(self._shutdown_check_interval)
+
+    def _activity_type(self, task):
+        try:
+            return self._worker.get_activity(task)[1]
+        except KeyError:  # unknown activity, it fails once processed
+            return None
+
+    def _max_task_wait(self, task):
+        activity_type = self._activity_type(task)
+        if activity_type is None:
+            return None
+        return self._prefetch.max_wait(activity_type)
+
+    def _task_expired(self, task, waited):
+        activity_type = self._activity_type(task)
+        if activity_type is None:
+            return False
+        timeout = self._prefetch.timeout(activity_type)
+        if timeout is None or waited < timeout:
+            return False
+
+        log.warning("Dropping activity task %s (%s), it waited %.1fs in the prefetch buffer, "
+                    "past its start_to_close_timeout", task.id, task.name, waited)
+        return True
+
+    def _process_task(self, task):
+        self._worker.process_activity_task(task)
+
+    def _tasks_in_progress(self):
+        # includes the tasks waiting in the queue
+        with self._stats_lock:
+            return self._tasks_polled - self._tasks_processed
+
+    def _flush_responses(self, timeout):
+        return self._worker.flush_responses(timeout)
+
+    def stats(self):
+        """Returns the executor metrics
+
+        :returns: dict with the *queue_depth* (tasks waiting for a worker),
+            *queue_size*, *pollers*, *workers*, *busy_workers*,
+            *worker_utilization* (ratio of busy workers), the counts of
+            *tasks_polled*, *empty_polls*, *tasks_started* and
+            *tasks_processed*, the total *queue_wait_time* and *busy_time*
+            in seconds, the prefetch *buffer_size* and count of
+            *expired_tasks* (None and 0 if not prefetching) and the
+            *autoscaling* metrics (None if not autoscaling)
+        :rtype: dict
+        """
+        with self._stats_lock:
+            stats = {'queue_depth': self._task_queue.qsize(),
+                     'queue_size': self._queue_size,
+                     'pollers': self._pollers,
+                     'workers': self._workers,
+                     'busy_workers': self._busy_workers,
+                     'worker_utilization': float(self._busy_workers) / self._workers,
+                     'tasks_polled': self._tasks_polled,
+                     'empty_polls': self._empty_polls,
+                     'tasks_started': self._tasks_started,
+                     'tasks_processed': self._tasks_processed,
+                     'queue_wait_time': self._queue_wait_time,
+                     'busy_time': self._busy_time,
+                     'buffer_size': None,
+                     'expired_tasks': self._expired_tasks}
+            if self._prefetch is not None:
+                stats['buffer_size'] = self._buffer_size()
+        stats['autoscaling'] = None
+        if self._autoscaler is not None:
+            stats['autoscaling'] = self._autoscaler.stats()
+        return stats
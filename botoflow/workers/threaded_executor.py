@@ -11,15 +11,20 @@
 # express or implied. See the License for the specific language governing
 # permissions and limitations under the License.
 
-from six.moves import queue
+import time
 import logging
 
+from six.moves import queue
+
 log = logging.getLogger(__name__)
 
 
 class ThreadedExecutor(object):
     """This will execute a worker using multiple threads."""
 
+    # how often (in seconds) drain checks for the tasks in progress
+    _drain_check_interval = 0.1
+
     def __init__(self, worker):
         self._worker = worker
 
@@ -49,10 +54,54 @@ class ThreadedExecutor(object):
 
         self._worker_shutdown = True
 
+    def drain(self, timeout=None):
+        """Stops polling for new tasks and waits for the tasks in progress to
+        finish, for rolling deploys and such:
+
+        .. code-block:: python
+
+            if not worker.drain(timeout=30):
+                log.warning("Some tasks did not finish in time")
+            sys.exit()
+
+        Unlike :py:meth:`join`, this does not wait for the long polls in
+        progress, which can take over a minute to return. The threads are
+        daemonic, so the polls are abandoned once the process exits. SWF
+        times out a task handed to an abandoned poll and schedules it again
+        (or fails it, for activity tasks), so nothing is lost.
+
+        :param float timeout: Maximum seconds to wait, forever if None.
+        :returns: True if all the tasks in progress finished in time
+        :rtype: bool
+        """
+        self.stop()
+        deadline = None
+        if timeout is not None:
+            deadline = time.time() + timeout
+
+        while self._tasks_in_progress():
+            if deadline is not None and time.time() >= deadline:
+                return False
+            time.sleep(self._drain_check_interval)
+
+        if deadline is not None:
+            return self._flush_responses(max(0, deadline - time.time()))
+        return self._flush_responses(None)
+
+    def _tasks_in_progress(self):
+        return self._worker.tasks_in_progress.value
+
+    def _flush_responses(self, timeout):
+        """Waits for the responses reported in the background, returns True
+        if all were reported in time
+        """
+        return True
+
     def join(self):
         """Will wait till all the threads are terminated
         """
         self._thread_queue.join()
+        self._flush_responses(None)
         self._running = False
 
     @property
@@ -52,6 +52,8 @@ class ThreadedWorkflowExecutor (ThreadedExecutor):
             raise ValueError("poller_threads count must be greater than 0")
 
         super(ThreadedWorkflowExecutor, self).start()
+        # every decider thread polls and responds with the worker's client
+        self._worker._reserve_connections(pollers)
 
         start_condition = threading.Condition()
 
@@ -0,0 +1,241 @@
+# Copyright 2013 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://aws.amazon.com/apache2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+"""
+Registration of the activity and workflow types by the workers on start.
+"""
+
+import os
+import json
+import time
+import random
+import threading
+import logging
+
+from six.moves import queue
+
+from ..swf_exceptions import (TypeAlreadyExistsError, ThrottlingException,
+                              swf_exception_wrapper)
+
+log = logging.getLogger(__name__)
+
+
+class TypeRegistrar(object):
+    """Registers the activity or workflow types of a worker with SWF.
+
+    The types already registered are listed first (all the pages of them),
+    and only the missing ones are registered, by up to :py:attr:`max_threads`
+    threads at a time. The throttled calls are retried up to
+    :py:attr:`max_retries` times, with a jittered exponential backoff
+    starting at :py:attr:`retry_delay` seconds.
+
+    If :py:attr:`cache_dir` is set, the registered types are cached in a file
+    there for :py:attr:`cache_ttl` seconds, so the workers restarting within
+    that time (and having no new types) don't call SWF at all.
+
+    The workers register their types as they are created, so the settings are
+    class attributes, to be changed before creating the workers:
+
+    .. code-block:: python
+
+        TypeRegistrar.cache_dir = '/var/cache/myworkers'
+        worker = ActivityWorker(session, 'us-east-1', 'SOMEDOMAIN', 'MYTASKLIST',
+                                MyActivities())
+
+    :param client: botocore SWF client
+    :param str domain: SWF domain to register the types in.
+    :param str task_list: task list of the worker, used as the default task
+        list of the types that use the worker's task list.
+    """
+
+    #: Directory of the cache files, no caching if None
+    cache_dir = None
+    #: Seconds the cached registered types are valid for
+    cache_ttl = 3600
+    #: Maximum count of types registered at the same time
+    max_threads = 8
+    #: Maximum count of retries of a throttled call
+    max_retries = 5
+    #: Seconds to wait before the first retry of a throttled call
+    retry_delay = 0.5
+
+    # (list method, register method, type info key) of the kinds of types
+    _kinds = {
+        'activity': ('list_activity_types', 'register_activity_type', 'activityType'),
+        'workflow': ('list_workflow_types', 'register_workflow_type', 'workflowType'),
+    }
+
+    def __init__(self, client, domain, task_list):
+        self.client = client
+        self.domain = domain
+        self.task_list = task_list
+
+    def register_activity_types(self, activity_types):
+        """Registers the *activity_types* that are not registered yet
+
+        :type activity_types: list of botoflow.flow_types.ActivityType
+        """
+        self._register_types('activity', activity_types)
+
+    def register_workflow_types(self, workflow_types):
+        """Registers the *workflow_types* that are not registered yet
+
+        :type workflow_types: list of botoflow.flow_types.WorkflowType
+        """
+        self._register_types('workflow', workflow_types)
+
+    def list_registered_types(self, kind):
+        """Returns the set of (name, version) tuples of all the registered
+        types of *kind*
+
+        :param str kind: 'activity' or 'workflow'
+        :rtype: set
+        """
+        list_method, _, info_key = self._kinds[kind]
+        kwargs = {'domain': self.domain, 'registrationStatus': 'REGISTERED',
+                  'maximumPageSize': 1000}
+
+        registered = set()
+        while True:
+            page = self._call_with_backoff(list_method, kwargs)
+            for type_info in page['typeInfos']:
+                registered.add((type_info[info_key]['name'], type_info[info_key]['version']))
+
+            next_page_token = page.get('nextPageToken')
+            if not next_page_token:
+                return registered
+            kwargs['nextPageToken'] = next_page_token
+
+    def _register_types(self, kind, flow_types):
+        wanted = dict()
+        for flow_type in flow_types:
+            if flow_type.skip_registration:
+                log.debug("Skipping %s '%s %s' registration because skip_registration is set to True",
+                          kind, flow_type.name, flow_type.version)
+                continue
+            wanted[(flow_type.name, flow_type.version)] = flow_type
+
+        if not wanted:
+            return
+
+        cached = self._load_cache(kind)
+        if cached is not None and set(wanted) <= cached:
+            log.debug("All %d %s types are registered according to the cache", len(wanted), kind)
+            return
+
+        registered = self.list_registered_types(kind)
+        missing = [flow_type for key, flow_type in wanted.items() if key not in registered]
+        for key in wanted:
+            if key in registered:
+                log.debug("Skipping registration of %s %s because it's already registered", *key)
+
+        self._register_concurrently(kind, missing)
+        self._save_cache(kind, registered.union(wanted))
+
+    def _register_concurrently(self, kind, flow_types):
+        threads = min(self.max_threads, len(flow_types))
+        if threads <= 1:
+            for flow_type in flow_types:
+                self._register_type(kind, flow_type)
+            return
+
+        pending = queue.Queue()
+        for flow_type in flow_types:
+            pending.put(flow_type)
+        errors = []
+
+        def register():
+            while True:
+                try:
+                    flow_type = pending.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    self._register_type(kind, flow_type)
+                except Exception as err:
+                    errors.append(err)
+
+        workers = [threading.Thread(target=register, name="TypeRegistrar-%d" % i)
+                   for i in range(threads)]
+        for thread in workers:
+            thread.daemon = True
+            thread.start()
+        for thread in workers:
+            thread.join()
+
+        if errors:
+            raise errors[0]
+
+    def _register_type(self, kind, flow_type):
+        _, register_method, _ = self._kinds[kind]
+        options = flow_type.to_registration_options_dict(self.domain, self.task_list)
+
+        log.debug("Registering %s with the following options: %s", kind, options)
+        try:
+            self._call_with_backoff(register_method, options)
+        except TypeAlreadyExistsError:
+            log.debug("%s '%s %s' already registered", kind.capitalize(),
+                      flow_type.name, flow_type.version)
+
+    def _call_with_backoff(self, method_name, kwargs):
+        delay = self.retry_delay
+        attempt = 0
+        while True:
+            try:
+                with swf_exception_wrapper():
+                    return getattr(self.client, method_name)(**kwargs)
+            except ThrottlingException as err:
+                if attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                sleep_time = delay + random.uniform(0, delay)
+                log.debug("%s was throttled (%r), retrying in %.2fs", method_name, err, sleep_time)
+                time.sleep(sleep_time)
+                delay *= 2
+
+    def _cache_path(self, kind):
+        region = getattr(self.client.meta, 'region_name', None)
+        return os.path.join(self.cache_dir, "botoflow-%s-%s-%s-types.json" % (region, self.domain, kind))
+
+    def _load_cache(self, kind):
+        """Returns the cached set of the registered types, or None if not
+        cached or expired
+        """
+        if self.cache_dir is None:
+            return None
+
+        try:
+            with open(self._cache_path(kind)) as cache_file:
+                cache = json.load(cache_file)
+        except (IOError, OSError, ValueError):
+            return None
+
+        if cache.get('expires', 0) < time.time():
+            return None
+        return set(tuple(key) for key in cache.get('types', ()))
+
+    def _save_cache(self, kind, registered):
+        if self.cache_dir is None:
+            return
+
+        path = self._cache_path(kind)
+        tmp_path = "%s.%d" % (path, os.getpid())
+        cache = {'expires': time.time() + self.cache_ttl,
+                 'types': sorted(registered)}
+        try:
+            with open(tmp_path, 'w') as cache_file:
+                json.dump(cache, cache_file)
+            # atomic, so the workers starting at the same time don't see
+            # partial files
+            os.rename(tmp_path, path)
+        except (IOError, OSError) as err:
+            log.warning("Could not save the registered %s types cache to %s: %r", kind, path, err)
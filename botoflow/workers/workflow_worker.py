@@ -72,6 +72,8 @@ class GenericWorkflowWorker(BaseWorker):
         super(GenericWorkflowWorker, self).__init__(session, aws_region, domain, task_list)
 
         self._get_workflow = get_workflow
+        self._priority_scheduling = False
+        self._profiler_dir = None
         self._setup()
 
     def __getstate__(self):
@@ -88,6 +90,43 @@ class GenericWorkflowWorker(BaseWorker):
         get_workflow = self._get_workflow_finder()
         self._decider = Decider(self, self.domain, self.task_list,
                                 get_workflow, self.identity)
+        self._decider.priority_scheduling = self._priority_scheduling
+        self._decider.profiler_dir = self._profiler_dir
+
+    @property
+    def priority_scheduling(self):
+        """If True, the decider's event loop runs the tasks by their priority
+        class (exception handlers and cancellations first, then continuations
+        and new coroutines last) instead of the default FIFO order.
+
+        See :py:class:`~botoflow.core.async_event_loop.AsyncEventLoop` for
+        details. Since the task order affects the order of the decisions, do
+        not change this while there are open workflow executions that were
+        decided with a different setting.
+        """
+        return self._priority_scheduling
+
+    @priority_scheduling.setter
+    def priority_scheduling(self, value):
+        self._priority_scheduling = value
+        self._decider.priority_scheduling = value
+
+    @property
+    def profiler_dir(self):
+        """If set, the decider profiles the event loop while making decisions
+        and saves a report (``<run_id>-<started_event_id>.txt``) and a
+        flamegraph compatible collapsed stack file (``.collapsed``) of every
+        decision task into this directory.
+
+        See :py:class:`~botoflow.core.async_profiler.AsyncProfiler` for
+        details.
+        """
+        return self._profiler_dir
+
+    @profiler_dir.setter
+    def profiler_dir(self, value):
+        self._profiler_dir = value
+        self._decider.profiler_dir = value
 
     def _get_workflow_finder(self):
         return self._get_workflow
@@ -174,8 +213,8 @@ class WorkflowWorker(GenericWorkflowWorker):
         if not getattr(self, '_workflows', None):
             self._setup_workflow_definitions()
 
-        for _, workflow_type, _ in six.itervalues(self._workflows):
-            self._register_workflow_type(workflow_type)
+        self._type_registrar().register_workflow_types(
+            [workflow_type for _, workflow_type, _ in six.itervalues(self._workflows)])
 
     def _get_workflow_finder(self):
         self._setup_workflow_definitions()
@@ -25,6 +25,7 @@ import logging
 from .context import StartWorkflowContext, get_context, set_context
 from .utils import random_sha1_hash
 from .swf_exceptions import swf_exception_wrapper
+from .client_pool import get_client
 from .exceptions import WorkflowFailedError, WorkflowTimedOutError, WorkflowTerminatedError
 
 log = logging.getLogger(__name__)
@@ -60,8 +61,8 @@ class workflow_starter(object):
         """
         self.domain = domain
         self.task_list = default_task_list
-        self.client = session.create_client(
-            service_name='swf', region_name=aws_region)
+        # shared with the other starters and workers of the session
+        self.client = get_client(session, aws_region)
 
     def __enter__(self):
         try:
@@ -1,5 +1,6 @@
 import pytest
 from botoflow.core import async_event_loop
+from botoflow.core.async_task_priority import PRIORITY_HANDLER, PRIORITY_CONTINUATION, PRIORITY_NEW
 
 pytestmark = pytest.mark.usefixtures('core_debug')
 
@@ -8,3 +9,60 @@ def test_smoke():
     ev = async_event_loop.AsyncEventLoop()
     assert None == ev.execute_all_tasks()
 
+
+
+class FakeTask(object):
+
+    def __init__(self, name, priority, log):
+        self.name = name
+        self.priority = priority
+        self.done = False
+        self._log = log
+
+    def run(self):
+        self.done = True
+        self._log.append(self.name)
+
+
+def test_fifo_order():
+    ran = []
+    ev = async_event_loop.AsyncEventLoop()
+    ev.execute(FakeTask('new', PRIORITY_NEW, ran))
+    ev.execute(FakeTask('handler', PRIORITY_HANDLER, ran))
+    ev.execute_now(FakeTask('now', PRIORITY_NEW, ran))
+    ev.execute_all_tasks()
+    assert ran == ['now', 'new', 'handler']
+
+
+def test_priority_order():
+    ran = []
+    ev = async_event_loop.AsyncEventLoop(priority_scheduling=True)
+    ev.execute(FakeTask('new', PRIORITY_NEW, ran))
+    ev.execute(FakeTask('continuation', PRIORITY_CONTINUATION, ran))
+    ev.execute(FakeTask('handler', PRIORITY_HANDLER, ran))
+    ev.execute_now(FakeTask('handler_now', PRIORITY_HANDLER, ran))
+    ev.execute_all_tasks()
+    assert ran == ['handler_now', 'handler', 'continuation', 'new']
+
+
+def test_priority_fairness():
+    ran = []
+    ev = async_event_loop.AsyncEventLoop(priority_scheduling=True, fairness_quantum=2)
+    ev.execute(FakeTask('new', PRIORITY_NEW, ran))
+    for i in range(4):
+        ev.execute(FakeTask(i, PRIORITY_HANDLER, ran))
+    ev.execute_all_tasks()
+    assert ran == [0, 1, 'new', 2, 3]
+
+
+def test_stats():
+    ran = []
+    ev = async_event_loop.AsyncEventLoop()
+    ev.execute(FakeTask('first', PRIORITY_NEW, ran))
+    ev.execute(FakeTask('second', PRIORITY_NEW, ran))
+    done_task = FakeTask('done', PRIORITY_NEW, ran)
+    done_task.done = True
+    ev.execute(done_task)
+    ev.execute_all_tasks()
+    assert ev.stats() == {'queue_depth': 0, 'max_queue_depth': 3,
+                          'tasks_queued': 3, 'tasks_run': 2}
@@ -0,0 +1,84 @@
+import six
+import pytest
+
+from botoflow.core.async_event_loop import AsyncEventLoop
+from botoflow.core.async_profiler import AsyncProfiler
+from botoflow.core.base_future import BaseFuture, return_
+from botoflow.core.decorators import coroutine, task
+
+pytestmark = pytest.mark.usefixtures('core_debug')
+
+
+def run_profiled(main):
+    ev = AsyncEventLoop()
+    ev.profiler = AsyncProfiler()
+    with ev:
+        future = main()
+    ev.execute_all_tasks()
+    return ev, future
+
+
+def test_coroutine_resumes():
+    external = BaseFuture()
+
+    @coroutine
+    def child():
+        yield external
+        return_(1)
+
+    @coroutine
+    def main():
+        result = yield child()
+        return_(result + 1)
+
+    ev, future = run_profiled(main)
+    external.set_result(None)
+    ev.execute_all_tasks()
+
+    assert future.result() == 2
+    coroutines = ev.profiler.coroutines
+    assert coroutines['main'].count == 2
+    assert coroutines['child'].count == 2
+    assert coroutines['main'].wall_time >= 0
+    assert set(ev.profiler.stacks) == {'Root;main', 'Root;main;child'}
+    assert ev.profiler.tasks
+
+
+def test_task():
+
+    @task
+    def some_task():
+        pass
+
+    @coroutine
+    def main():
+        some_task()
+        yield BaseFuture.with_result(None)
+
+    ev, future = run_profiled(main)
+    assert future.done()
+    assert ev.profiler.tasks['some_task'].count == 1
+
+
+def test_report_and_collapsed():
+
+    @coroutine
+    def main():
+        yield BaseFuture.with_result(None)
+
+    ev, _ = run_profiled(main)
+
+    report = ev.profiler.report(limit=1)
+    assert report.startswith("Coroutines:")
+    assert "main" in report
+
+    collapsed = six.StringIO()
+    ev.profiler.dump_collapsed(collapsed)
+    line, = collapsed.getvalue().splitlines()
+    stack, count = line.rsplit(' ', 1)
+    assert stack == 'Root;main'
+    assert int(count) >= 1
+
+    ev.profiler.reset()
+    assert not ev.profiler.coroutines
+    assert not ev.profiler.stacks
@@ -4,11 +4,13 @@ import logging
 import pytest
 
 import sys
+import pickle
 import six
 
 from botoflow.core.async_event_loop import AsyncEventLoop
 from botoflow.core.decorators import coroutine, task
-from botoflow.core.async_traceback import format_exc, print_exc
+from botoflow.core.async_traceback import format_exc, print_exc, extract_tb
+from botoflow.core.utils import LazyTracebackList, CONTINUATION_FRAME
 from botoflow.logging_filters import BotoflowFilter
 
 logging.basicConfig(level=logging.DEBUG,
@@ -108,6 +110,47 @@ class TestTraceback(unittest.TestCase):
         self.assertTrue(self.tb_str)
         self.assertEqual(2, self.tb_str.count('---continuation---'))
 
+    def test_extract_tb_returns_list(self):
+        @task
+        def task_func():
+            raise RuntimeError("Test")
+
+        @task_func.do_except
+        def except_func(err):
+            self.tb_list = extract_tb()
+
+        ev = AsyncEventLoop()
+        with ev:
+            task_func()
+        ev.execute_all_tasks()
+
+        self.assertIs(list, type(self.tb_list))
+        self.assertIn(CONTINUATION_FRAME, self.tb_list)
+        self.assertEqual('task_func', self.tb_list[-1][2])
+
+
+def test_lazy_traceback_list():
+    def raises():
+        raise RuntimeError("Test")
+
+    try:
+        raises()
+    except RuntimeError:
+        tb = sys.exc_info()[2]
+
+    stack = [('file.py', 1, 'func', 'func()')]
+    tb_list = LazyTracebackList([stack], tb)
+    assert tb_list._tb_list is None
+
+    assert len(tb_list) == 4
+    assert tb_list[0] == stack[0]
+    assert tb_list[1] == CONTINUATION_FRAME
+    assert tb_list[2][2] == 'test_lazy_traceback_list'
+    assert tb_list[3][2] == 'raises'
+    assert tb_list == list(tb_list)
+    assert tb_list[1:] == list(tb_list)[1:]
+    assert pickle.loads(pickle.dumps(tb_list)) == list(tb_list)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,165 @@
+import functools
+
+import pytest
+
+from botoflow.core.async_event_loop import AsyncEventLoop
+from botoflow.core.base_future import BaseFuture, return_
+from botoflow.core.bounded_future import gather_bounded, as_completed_bounded
+from botoflow.core.decorators import coroutine
+
+pytestmark = pytest.mark.usefixtures('core_debug')
+
+
+class FakeActivities(object):
+    """Hands out external futures, so the test decides when they complete"""
+
+    def __init__(self):
+        self.futures = []
+        self.max_open = 0
+
+    def call(self, value):
+        future = BaseFuture()
+        future.value = value
+        self.futures.append(future)
+        self.max_open = max(self.max_open, len(self.open_futures))
+        return future
+
+    @property
+    def open_futures(self):
+        return [future for future in self.futures if not future.done()]
+
+
+def complete_all(ev, activities, reverse=False):
+    while activities.open_futures:
+        futures = activities.open_futures
+        future = futures[-1] if reverse else futures[0]
+        future.set_result(future.value * 10)
+        ev.execute_all_tasks()
+
+
+def test_gather_bounded():
+    activities = FakeActivities()
+
+    @coroutine
+    def main():
+        results = yield gather_bounded(
+            (functools.partial(activities.call, i) for i in range(10)), max_in_flight=3)
+        return_(results)
+
+    ev = AsyncEventLoop()
+    with ev:
+        future = main()
+    ev.execute_all_tasks()
+
+    assert len(activities.open_futures) == 3
+    complete_all(ev, activities, reverse=True)
+
+    assert future.result() == tuple(i * 10 for i in range(10))
+    assert activities.max_open == 3
+
+
+def test_gather_bounded_empty():
+    @coroutine
+    def main():
+        results = yield gather_bounded([], max_in_flight=3)
+        return_(results)
+
+    ev = AsyncEventLoop()
+    with ev:
+        future = main()
+    ev.execute_all_tasks()
+
+    assert future.result() == tuple()
+
+
+def test_gather_bounded_plain_values():
+    @coroutine
+    def main():
+        results = yield gather_bounded([lambda: 1, lambda: 2], max_in_flight=1)
+        return_(results)
+
+    ev = AsyncEventLoop()
+    with ev:
+        future = main()
+    ev.execute_all_tasks()
+
+    assert future.result() == (1, 2)
+
+
+def test_gather_bounded_exception_stops_scheduling():
+    activities = FakeActivities()
+
+    @coroutine
+    def main():
+        try:
+            yield gather_bounded(
+                (functools.partial(activities.call, i) for i in range(10)), max_in_flight=2)
+        except RuntimeError as err:
+            return_(str(err))
+
+    ev = AsyncEventLoop()
+    with ev:
+        future = main()
+    ev.execute_all_tasks()
+
+    activities.futures[0].set_exception(RuntimeError("failed"))
+    ev.execute_all_tasks()
+
+    assert future.result() == "failed"
+    assert len(activities.futures) == 2
+
+
+def test_gather_bounded_invalid_max_in_flight():
+    with pytest.raises(ValueError):
+        gather_bounded([], max_in_flight=0)
+
+
+def test_as_completed_bounded():
+    activities = FakeActivities()
+    results = []
+
+    @coroutine
+    def main():
+        calls = (functools.partial(activities.call, i) for i in range(5))
+        for future in as_completed_bounded(calls, max_in_flight=2):
+            result = yield future
+            results.append(result)
+
+    ev = AsyncEventLoop()
+    with ev:
+        future = main()
+    ev.execute_all_tasks()
+
+    assert len(activities.open_futures) == 2
+    complete_all(ev, activities, reverse=True)
+
+    assert future.done()
+    assert results == [10, 20, 30, 40, 0]
+    assert activities.max_open == 2
+
+
+def test_as_completed_bounded_exception():
+    activities = FakeActivities()
+    results = []
+
+    @coroutine
+    def main():
+        calls = (functools.partial(activities.call, i) for i in range(3))
+        for future in as_completed_bounded(calls, max_in_flight=3):
+            try:
+                result = yield future
+            except RuntimeError as err:
+                result = str(err)
+            results.append(result)
+
+    ev = AsyncEventLoop()
+    with ev:
+        future = main()
+    ev.execute_all_tasks()
+
+    activities.futures[1].set_exception(RuntimeError("failed"))
+    ev.execute_all_tasks()
+    complete_all(ev, activities)
+
+    assert future.done()
+    assert results == ["failed", 0, 20]
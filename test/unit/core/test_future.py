@@ -5,7 +5,8 @@ import pytest
 from botoflow.core.async_event_loop import AsyncEventLoop
 from botoflow.core.decorators import coroutine
 from botoflow.core.base_future import BaseFuture, return_
-from botoflow.core.future import AllFuture, AnyFuture, Future
+from botoflow.core.future import (AllFuture, AnyFuture, Future, as_completed, wait, FIRST_COMPLETED,
+                                  FIRST_EXCEPTION, ALL_COMPLETED)
 from botoflow.core.exceptions import CancellationError
 from botoflow.logging_filters import BotoflowFilter
 
@@ -499,5 +500,138 @@ class TestAnyFuture(unittest.TestCase):
         self.assertFalse(future.result())
 
 
+class TestAsCompleted(unittest.TestCase):
+
+    def test_completion_order(self):
+        futures = [BaseFuture() for _ in range(3)]
+        results = []
+
+        @coroutine
+        def main():
+            for future in as_completed(futures):
+                result = yield future
+                results.append(result)
+
+        ev = AsyncEventLoop()
+        with ev:
+            future = main()
+        ev.execute_all_tasks()
+
+        for i in (2, 0, 1):
+            futures[i].set_result(i)
+            ev.execute_all_tasks()
+
+        self.assertTrue(future.done())
+        self.assertEqual([2, 0, 1], results)
+
+    def test_already_done(self):
+        futures = [BaseFuture.with_result(1), BaseFuture.with_result(2)]
+
+        @coroutine
+        def main():
+            results = []
+            for future in as_completed(futures):
+                result = yield future
+                results.append(result)
+            return_(results)
+
+        ev = AsyncEventLoop()
+        with ev:
+            future = main()
+        ev.execute_all_tasks()
+
+        self.assertEqual([1, 2], future.result())
+
+    def test_exception(self):
+        futures = [BaseFuture(), BaseFuture()]
+
+        @coroutine
+        def main():
+            results = []
+            for future in as_completed(futures):
+                try:
+                    results.append((yield future))
+                except RuntimeError:
+                    results.append('error')
+            return_(results)
+
+        ev = AsyncEventLoop()
+        with ev:
+            future = main()
+        ev.execute_all_tasks()
+        futures[1].set_exception(RuntimeError())
+        futures[0].set_result(0)
+        ev.execute_all_tasks()
+
+        self.assertEqual(['error', 0], future.result())
+
+    def test_empty(self):
+        self.assertEqual([], list(as_completed([])))
+
+
+class TestWait(unittest.TestCase):
+
+    def test_first_completed(self):
+        futures = [BaseFuture(), BaseFuture(), BaseFuture()]
+
+        ev = AsyncEventLoop()
+        with ev:
+            wait_future = wait(futures, return_when=FIRST_COMPLETED)
+        futures[1].set_result(1)
+        futures[2].set_result(2)
+        ev.execute_all_tasks()
+
+        done, not_done = wait_future.result()
+        self.assertEqual([futures[1]], done)
+        self.assertEqual([futures[0], futures[2]], not_done)
+
+    def test_first_exception(self):
+        futures = [BaseFuture(), BaseFuture(), BaseFuture()]
+
+        ev = AsyncEventLoop()
+        with ev:
+            wait_future = wait(futures, return_when=FIRST_EXCEPTION)
+        futures[0].set_result(0)
+        ev.execute_all_tasks()
+        self.assertFalse(wait_future.done())
+
+        futures[2].set_exception(RuntimeError())
+        ev.execute_all_tasks()
+
+        done, not_done = wait_future.result()
+        self.assertEqual([futures[0], futures[2]], done)
+        self.assertEqual([futures[1]], not_done)
+
+    def test_all_completed(self):
+        futures = [BaseFuture(), BaseFuture()]
+
+        @coroutine
+        def main():
+            done, not_done = yield wait(futures)
+            return_((len(done), len(not_done)))
+
+        ev = AsyncEventLoop()
+        with ev:
+            future = main()
+        ev.execute_all_tasks()
+        futures[1].set_exception(RuntimeError())
+        ev.execute_all_tasks()
+        self.assertFalse(future.done())
+
+        futures[0].set_result(0)
+        ev.execute_all_tasks()
+        self.assertEqual((2, 0), future.result())
+
+    def test_empty(self):
+        ev = AsyncEventLoop()
+        with ev:
+            wait_future = wait([], return_when=ALL_COMPLETED)
+        self.assertEqual(([], []), wait_future.result())
+
+    def test_invalid_return_when(self):
+        with self.assertRaises(ValueError):
+            wait([], return_when='SOMETIMES')
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -59,3 +59,29 @@ def test_decide_reordered(m_old_context, m_context):
     assert m_handle_history_event.mock_calls == [call(events[0]), call(events[4]), call(events[5]), call(events[8]),
                                                  call(events[10]), call(events[11]), call(events[14]),
                                                  call(events[19]), call(events[16]), call(events[17])]
+
+
+@patch.object(decider, 'get_context')
+@patch.object(decider, 'set_context')
+def test_decide_saves_profile(m_old_context, m_context, tmpdir):
+    date = datetime(1975, 5, 25)
+    events = [WorkflowExecutionStarted(1, date, {}),
+              DecisionTaskScheduled(2, date, {}),
+              DecisionTaskStarted(3, date, {})]
+
+    m_worker = MagicMock(spec=GenericWorkflowWorker)
+    m_poller = MagicMock(spec=DecisionTaskPoller)
+    m_decision_task = MagicMock(spec=DecisionTask, workflow_id='unit-wfid', run_id='unit/runid', task_token='unit-tt',
+                                previous_started_event_id=0, started_event_id=3, events=iter(events))
+    m_poller().poll.return_value = m_decision_task
+
+    decider_inst = decider.Decider(m_worker, 'unit-domain', 'unit-tlist', MagicMock(),
+                                   'unit-id', _Poller=m_poller)
+    decider_inst.profiler_dir = str(tmpdir)
+    decider_inst._process_decisions = MagicMock(spec=decider.Decider._process_decisions)
+    decider_inst._handle_history_event = MagicMock(spec=decider.Decider._handle_history_event)
+
+    decider_inst.decide()
+
+    assert sorted(path.basename for path in tmpdir.listdir()) == ['unit_runid-3.collapsed', 'unit_runid-3.txt']
+    assert tmpdir.join('unit_runid-3.txt').read().startswith("Coroutines:")
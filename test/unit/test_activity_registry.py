@@ -0,0 +1,73 @@
+import dill
+import pytest
+from mock import patch
+
+from botocore.session import Session
+
+from botoflow import activities, activity
+from botoflow.activity_registry import INDEX_ATTR, activity_names, _scanned_classes
+from botoflow.context import set_context
+from botoflow.workers.activity_worker import ActivityWorker
+from botoflow.workers.base_worker import BaseWorker
+
+
+@pytest.fixture(autouse=True)
+def no_context():
+    # activities can only be looked up outside of the workflow contexts
+    set_context(None)
+
+
+@activities(schedule_to_start_timeout=60, start_to_close_timeout=60)
+class RegistryActivities(object):
+
+    @activity(version='1.0')
+    def first(self):
+        return 1
+
+    @activity(version='1.0')
+    def second(self):
+        return 2
+
+    def helper(self):
+        pass
+
+
+class SubclassedActivities(RegistryActivities):
+
+    @activity(version='1.0', schedule_to_start_timeout=60, start_to_close_timeout=60)
+    def third(self):
+        return 3
+
+
+def test_activities_indexed_on_class_creation():
+    assert sorted(RegistryActivities.__dict__[INDEX_ATTR]) == ['first', 'second']
+    assert sorted(activity_names(RegistryActivities)) == ['first', 'second']
+
+
+def test_undecorated_subclass_scanned_once():
+    assert INDEX_ATTR not in SubclassedActivities.__dict__
+    with patch('botoflow.activity_registry._scan', return_value=('first', 'second', 'third')) as scan:
+        _scanned_classes.pop(SubclassedActivities, None)
+        assert activity_names(SubclassedActivities) == ('first', 'second', 'third')
+        assert activity_names(SubclassedActivities) == ('first', 'second', 'third')
+    assert scan.call_count == 1
+
+    _scanned_classes.pop(SubclassedActivities, None)
+    assert sorted(activity_names(SubclassedActivities)) == ['first', 'second', 'third']
+
+
+def test_worker_dispatch_index():
+    with patch.object(BaseWorker, '_fix_endpoint'), \
+            patch.object(ActivityWorker, '_register_activities'):
+        worker = ActivityWorker(Session(), 'us-east-1', 'domain', 'task_list', RegistryActivities())
+
+    assert sorted(worker._activity_names_to_methods) == ['RegistryActivities.first',
+                                                         'RegistryActivities.second']
+    func, activity_type = worker._activity_names_to_methods['RegistryActivities.second']
+    assert func() == 2
+    assert activity_type.version == '1.0'
+
+    with patch.object(BaseWorker, '_fix_endpoint'):
+        worker = dill.loads(dill.dumps(worker))
+    func, _ = worker._activity_names_to_methods['RegistryActivities.first']
+    assert func() == 1
@@ -0,0 +1,106 @@
+import sys
+import time
+import threading
+
+import pytest
+from mock import MagicMock, patch
+from botocore.session import Session
+
+from botoflow import activities, activity, get_context
+from botoflow.data_converter import JSONDataConverter
+from botoflow.workers.activity_worker import ActivityWorker
+from botoflow.workers.base_worker import BaseWorker
+
+pytestmark = pytest.mark.skipif(sys.version_info < (3, 7), reason="requires Python 3.7+")
+
+
+class Counter(object):
+
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+
+    def enter(self):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+
+    def exit(self):
+        self.running -= 1
+
+
+counter = Counter()
+
+
+@activities(schedule_to_start_timeout=60,
+            start_to_close_timeout=60)
+class AsyncActivities(object):
+
+    @activity(version='1.0')
+    async def async_sum(self, x, y):
+        import asyncio
+        counter.enter()
+        get_context().heartbeat()
+        await asyncio.sleep(0.05)
+        counter.exit()
+        return x + y
+
+    @activity(version='1.0')
+    def sync_mul(self, x, y):
+        assert get_context().task.name == 'AsyncActivities.sync_mul'
+        return x * y
+
+
+def make_task_dict(name, args, task_id):
+    return {'activityId': task_id,
+            'activityType': {'name': name, 'version': '1.0'},
+            'input': JSONDataConverter().dumps([args, {}]),
+            'startedEventId': 1,
+            'taskToken': 'token-%s' % task_id,
+            'workflowExecution': {'workflowId': 'wfid', 'runId': 'runid'}}
+
+
+@patch.object(BaseWorker, '_fix_endpoint')
+@patch.object(ActivityWorker, '_register_activities')
+def test_async_activities(m_register, m_fix_endpoint):
+    from botoflow.workers import AsyncActivityExecutor
+
+    worker = ActivityWorker(Session(), 'us-east-1', 'domain', 'task-list', AsyncActivities())
+    worker._client = client = MagicMock()
+    client.record_activity_task_heartbeat.return_value = {'cancelRequested': False}
+
+    tasks = [make_task_dict('AsyncActivities.async_sum', [i, 1], str(i)) for i in range(4)]
+    tasks.append(make_task_dict('AsyncActivities.sync_mul', [2, 3], 'mul'))
+    lock = threading.Lock()
+
+    executor = AsyncActivityExecutor(worker)
+
+    def poll_for_activity_task(**kwargs):
+        with lock:
+            if tasks:
+                return tasks.pop(0)
+        executor.stop()
+        time.sleep(0.01)
+        return {'startedEventId': 0}
+
+    client.poll_for_activity_task.side_effect = poll_for_activity_task
+
+    executor.start(pollers=2, max_concurrent_activities=2)
+    executor.join()
+
+    completed = sorted((call[2]['taskToken'], call[2]['result'])
+                       for call in client.respond_activity_task_completed.mock_calls)
+    assert completed == [('token-0', '1'), ('token-1', '2'), ('token-2', '3'), ('token-3', '4'),
+                         ('token-mul', '6')]
+
+    assert counter.max_running <= 2
+    assert client.record_activity_task_heartbeat.called
+
+
+def test_invalid_start_args():
+    from botoflow.workers import AsyncActivityExecutor
+
+    executor = AsyncActivityExecutor(MagicMock())
+    with pytest.raises(ValueError):
+        executor.start(pollers=0)
+    with pytest.raises(ValueError):
+        executor.start(max_concurrent_activities=0)
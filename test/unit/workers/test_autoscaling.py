@@ -0,0 +1,117 @@
+import time
+import threading
+
+import pytest
+from mock import MagicMock
+
+from botoflow.workers.autoscaling import AutoscalingPolicy, AutoscalingSample, Autoscaler
+from botoflow.workers.threaded_activity_executor import ThreadedActivityExecutor
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition():
+        if time.time() > deadline:
+            raise AssertionError("Timed out waiting for condition")
+        time.sleep(0.01)
+
+
+def test_policy_scales_workers_up_when_saturated():
+    policy = AutoscalingPolicy(max_workers=10)
+    busy = AutoscalingSample(polls=10, empty_poll_rate=0.0, queue_latency=0.0, utilization=0.9)
+    assert policy.scale(1, 4, busy) == (1, 8)
+    assert policy.scale(1, 8, busy) == (1, 10)
+
+    waiting = AutoscalingSample(polls=10, empty_poll_rate=0.0, queue_latency=5.0, utilization=0.5)
+    assert policy.scale(1, 4, waiting) == (1, 8)
+
+
+def test_policy_scales_down_with_hysteresis():
+    policy = AutoscalingPolicy(scale_down_intervals=2)
+    idle = AutoscalingSample(polls=10, empty_poll_rate=1.0, queue_latency=0.0, utilization=0.0)
+    assert policy.scale(3, 4, idle) == (3, 4)
+    assert policy.scale(3, 4, idle) == (2, 3)
+    assert policy.scale(2, 3, idle) == (2, 3)
+
+    # a busy interval resets the votes
+    normal = AutoscalingSample(polls=10, empty_poll_rate=0.1, queue_latency=0.0, utilization=0.5)
+    assert policy.scale(2, 3, normal) == (2, 3)
+    assert policy.scale(2, 3, idle) == (2, 3)
+
+    bottom = AutoscalingPolicy(scale_down_intervals=1)
+    assert bottom.scale(1, 1, idle) == (1, 1)
+
+
+def test_policy_adds_pollers_when_pollers_are_the_bottleneck():
+    policy = AutoscalingPolicy(max_pollers=3)
+    sample = AutoscalingSample(polls=10, empty_poll_rate=0.0, queue_latency=0.0, utilization=0.5)
+    assert policy.scale(1, 4, sample) == (2, 4)
+    assert policy.scale(3, 4, sample) == (3, 4)
+
+
+def test_policy_validation():
+    with pytest.raises(ValueError):
+        AutoscalingPolicy(min_pollers=2, max_pollers=1)
+    with pytest.raises(ValueError):
+        AutoscalingPolicy(min_workers=0)
+    with pytest.raises(ValueError):
+        AutoscalingPolicy(scale_down_utilization=0.9, scale_up_utilization=0.8)
+
+
+def test_autoscaler_sample():
+    autoscaler = Autoscaler(MagicMock(), AutoscalingPolicy())
+    autoscaler._last_stats = {'tasks_polled': 10, 'empty_polls': 5, 'tasks_started': 10,
+                              'queue_wait_time': 1.0, 'busy_time': 10.0}
+    stats = {'tasks_polled': 16, 'empty_polls': 7, 'tasks_started': 14,
+             'queue_wait_time': 3.0, 'busy_time': 25.0, 'workers': 2}
+
+    sample = autoscaler.sample(stats, 10.0)
+    assert sample.polls == 8
+    assert sample.empty_poll_rate == 0.25
+    assert sample.queue_latency == 0.5
+    assert sample.utilization == 0.75
+
+
+def test_executor_resize():
+    release = threading.Event()
+    worker = MagicMock()
+    worker.poll_for_activity_task.side_effect = lambda: (release.wait(5), None)[1]
+
+    executor = ThreadedActivityExecutor(worker)
+    executor._shutdown_check_interval = 0.01
+    executor.start(pollers=1, workers=1)
+
+    executor.resize(pollers=3, workers=4)
+    assert executor._active_pollers == 3
+    assert executor._active_workers == 4
+
+    executor.resize(workers=2)
+    wait_for(lambda: executor._active_workers == 2)
+    executor.resize(pollers=1)
+    release.set()
+    wait_for(lambda: executor._active_pollers == 1)
+
+    stats = executor.stats()
+    assert (stats['pollers'], stats['workers']) == (1, 2)
+
+    executor.stop()
+    executor.join()
+    assert executor._active_pollers == executor._active_workers == 0
+
+
+def test_executor_autoscaling():
+    worker = MagicMock()
+    worker.poll_for_activity_task.side_effect = lambda: (time.sleep(0.005), object())[1]
+    worker.process_activity_task.side_effect = lambda task: time.sleep(0.02)
+
+    executor = ThreadedActivityExecutor(worker)
+    executor._shutdown_check_interval = 0.01
+    executor.start(pollers=1, workers=1,
+                   autoscaling=AutoscalingPolicy(max_pollers=2, max_workers=4, interval=0.05))
+
+    wait_for(lambda: executor.stats()['workers'] == 4)
+    stats = executor.stats()
+    assert stats['autoscaling']['scale_ups'] >= 1
+
+    executor.stop()
+    executor.join()
@@ -0,0 +1,48 @@
+import pickle
+import threading
+
+from mock import patch
+from botocore.session import Session
+
+from botoflow.workers.base_worker import BaseWorker, TaskCounter
+
+
+def test_task_counter():
+    counter = TaskCounter()
+
+    def count():
+        for _ in range(1000):
+            with counter:
+                pass
+
+    threads = [threading.Thread(target=count) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    with counter:
+        assert counter.value >= 1
+    for thread in threads:
+        thread.join()
+    assert counter.value == 0
+
+    with counter:
+        assert pickle.loads(pickle.dumps(counter)).value == 0
+
+
+@patch.object(BaseWorker, '_fix_endpoint')
+@patch('botoflow.workers.base_worker.time')
+def test_wait_for_interrupted_poll(m_time, m_fix_endpoint):
+    worker = BaseWorker(Session(), 'us-east-1', 'domain', 'task-list')
+    m_time.time.return_value = 100
+
+    worker._wait_for_interrupted_poll(poll_time=90)
+    m_time.sleep.assert_called_once_with(50)
+
+    m_time.reset_mock()
+    worker.poll_interrupt_wait = 0
+    worker._wait_for_interrupted_poll(poll_time=90)
+    assert not m_time.sleep.called
+
+    m_time.reset_mock()
+    worker.poll_interrupt_wait = 60
+    m_time.sleep.side_effect = KeyboardInterrupt
+    worker._wait_for_interrupted_poll(poll_time=90)  # second Ctrl-C exits right away
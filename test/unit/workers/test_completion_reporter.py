@@ -0,0 +1,111 @@
+import threading
+
+import pytest
+from mock import MagicMock, patch
+
+from botocore.session import Session
+
+from botoflow.swf_exceptions import ThrottlingException, UnknownResourceError
+from botoflow.workers.activity_worker import ActivityWorker
+from botoflow.workers.base_worker import BaseWorker, TaskCounter
+from botoflow.workers.completion_reporter import CompletionReporter
+from botoflow.workers.threaded_activity_executor import ThreadedActivityExecutor
+
+RESPONSE = ('respond_activity_task_completed', {'taskToken': 'token', 'result': '1'})
+
+
+@pytest.fixture
+def worker():
+    worker = MagicMock()
+    worker.tasks_in_progress = TaskCounter()
+    return worker
+
+
+def test_report(worker):
+    reporter = CompletionReporter(worker)
+    reporter.report(RESPONSE)
+    reporter.report(None)  # manual activities have nothing to report
+
+    assert reporter.flush(timeout=5)
+    worker.send_response.assert_called_once_with(RESPONSE)
+    assert reporter.stats() == {'pending': 0, 'reported': 1, 'retries': 0, 'failures': 0}
+
+
+def test_task_in_progress_until_reported(worker):
+    release = threading.Event()
+    worker.send_response.side_effect = lambda response: release.wait(5)
+
+    reporter = CompletionReporter(worker)
+    reporter.report(RESPONSE)
+    assert worker.tasks_in_progress.value == 1
+    assert not reporter.flush(timeout=0.05)
+
+    release.set()
+    assert reporter.flush(timeout=5)
+    assert worker.tasks_in_progress.value == 0
+
+
+def test_throttled_report_retried(worker):
+    worker.send_response.side_effect = [ThrottlingException("slow down"),
+                                        ThrottlingException("slow down"), None]
+
+    reporter = CompletionReporter(worker, retry_delay=0.01)
+    reporter.report(RESPONSE)
+
+    assert reporter.flush(timeout=5)
+    assert worker.send_response.call_count == 3
+    assert reporter.stats() == {'pending': 0, 'reported': 1, 'retries': 2, 'failures': 0}
+
+
+def test_report_given_up(worker):
+    worker.send_response.side_effect = ThrottlingException("slow down")
+
+    reporter = CompletionReporter(worker, max_retries=2, retry_delay=0.01)
+    reporter.report(RESPONSE)
+
+    assert reporter.flush(timeout=5)
+    assert worker.send_response.call_count == 3
+    assert worker.unhandled_exception_handler.call_count == 1
+    assert reporter.stats()['failures'] == 1
+
+
+def test_timed_out_task_not_retried(worker):
+    worker.send_response.side_effect = UnknownResourceError("unknown task")
+
+    reporter = CompletionReporter(worker)
+    reporter.report(RESPONSE)
+
+    assert reporter.flush(timeout=5)
+    assert worker.send_response.call_count == 1
+    assert not worker.unhandled_exception_handler.called
+
+
+def test_activity_worker_background_responses():
+    with patch.object(BaseWorker, '_fix_endpoint'), \
+            patch.object(ActivityWorker, '_register_activities'):
+        worker = ActivityWorker(Session(), 'us-east-1', 'domain', 'task_list')
+    worker._client = MagicMock()
+
+    worker.background_responses = True
+    assert isinstance(worker.completion_reporter, CompletionReporter)
+
+    worker.respond(RESPONSE)
+    assert worker.flush_responses(timeout=5)
+    worker._client.respond_activity_task_completed.assert_called_once_with(**RESPONSE[1])
+
+    worker.background_responses = False
+    assert worker.completion_reporter is None
+    assert worker.flush_responses()
+
+
+def test_executor_drain_waits_for_responses():
+    worker = MagicMock()
+    worker.poll_for_activity_task.return_value = None
+    worker.flush_responses.return_value = False
+
+    executor = ThreadedActivityExecutor(worker)
+    executor._shutdown_check_interval = 0.01
+    executor.start(pollers=1, workers=1)
+
+    assert executor.drain(timeout=1) is False
+    worker.flush_responses.assert_called_once()
@@ -0,0 +1,130 @@
+import time
+
+import dill
+import pytest
+from mock import MagicMock, patch
+
+from botocore.session import Session
+
+from botoflow.context import ActivityContext
+from botoflow.core.exceptions import CancellationError
+from botoflow.workers.activity_worker import ActivityWorker
+from botoflow.workers.base_worker import BaseWorker
+from botoflow.workers.heartbeat_manager import HeartbeatManager
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition():
+        if time.time() > deadline:
+            raise AssertionError("Timed out waiting for condition")
+        time.sleep(0.01)
+
+
+class FakeWorker(object):
+
+    def __init__(self, cancel_requested=False):
+        self.heartbeats = []
+        self.cancel_requested = cancel_requested
+
+    def request_heartbeat(self, task, details=None):
+        self.heartbeats.append((task.token, details))
+        return {'cancelRequested': self.cancel_requested}
+
+
+def make_task(token='token'):
+    task = MagicMock()
+    task.token = token
+    return task
+
+
+def test_interval():
+    manager = HeartbeatManager(FakeWorker(), max_interval=30, timeout_ratio=0.5)
+    assert manager.interval(None) == 30
+    assert manager.interval('NONE') == 30
+    assert manager.interval('10') == 5
+    assert manager.interval(600) == 30
+
+
+def test_heartbeats_coalesced():
+    worker = FakeWorker()
+    manager = HeartbeatManager(worker, max_interval=0.2)
+    task = make_task()
+    try:
+        manager.heartbeat(task, 'first')
+        wait_for(lambda: len(worker.heartbeats) == 1)
+        for i in range(10):
+            assert not manager.heartbeat(task, str(i))
+
+        # the rest is sent at once, after the interval
+        assert len(worker.heartbeats) == 1
+        wait_for(lambda: len(worker.heartbeats) == 2)
+        time.sleep(0.3)
+    finally:
+        manager.stop()
+
+    assert worker.heartbeats == [('token', 'first'), ('token', '9')]
+    assert manager.stats() == {'tasks': 1, 'heartbeats_requested': 11, 'heartbeats_sent': 2}
+
+
+def test_cancel_requested_and_discard():
+    worker = FakeWorker(cancel_requested=True)
+    manager = HeartbeatManager(worker, max_interval=10)
+    task = make_task()
+    try:
+        assert not manager.heartbeat(task)
+        wait_for(lambda: worker.heartbeats)
+        wait_for(lambda: manager.heartbeat(task))
+
+        manager.discard(task)
+        assert manager.stats()['tasks'] == 0
+    finally:
+        manager.stop()
+    assert len(worker.heartbeats) == 1
+
+
+def test_heartbeat_failure_logged():
+    worker = FakeWorker()
+    worker.request_heartbeat = MagicMock(side_effect=RuntimeError("throttled"))
+    manager = HeartbeatManager(worker)
+    task = make_task()
+    try:
+        manager.heartbeat(task)
+        wait_for(lambda: worker.request_heartbeat.called)
+        assert not manager.heartbeat(task)
+    finally:
+        manager.stop()
+
+
+def test_pickle():
+    manager = HeartbeatManager(FakeWorker(), max_interval=5)
+    manager.heartbeat(make_task())
+    manager.stop()
+
+    manager = dill.loads(dill.dumps(manager))
+    assert manager.max_interval == 5
+    assert manager.stats()['tasks'] == 0
+
+
+def test_activity_context_background_heartbeat():
+    with patch.object(BaseWorker, '_fix_endpoint'), \
+            patch.object(ActivityWorker, '_register_activities'):
+        worker = ActivityWorker(Session(), 'us-east-1', 'domain', 'task_list')
+    worker._client = MagicMock()
+    worker._client.record_activity_task_heartbeat.return_value = {'cancelRequested': True}
+    worker.get_activity = MagicMock(return_value=(None, MagicMock(heartbeat_timeout='60')))
+
+    worker.background_heartbeats = True
+    worker.heartbeat_interval = 10
+    assert worker.heartbeat_manager.max_interval == 10
+
+    context = ActivityContext(worker, make_task())
+    try:
+        context.heartbeat('details')
+        wait_for(lambda: worker._client.record_activity_task_heartbeat.called)
+        with pytest.raises(CancellationError):
+            wait_for(lambda: context.heartbeat('details') and False)
+    finally:
+        worker.background_heartbeats = False
+    assert worker.heartbeat_manager is None
+    assert worker._client.record_activity_task_heartbeat.call_count == 1
@@ -0,0 +1,68 @@
+import pickle
+import time
+
+import pytest
+from mock import patch
+
+from botocore.session import Session
+
+from botoflow.workers.activity_worker import ActivityWorker
+from botoflow.workers.base_worker import BaseWorker
+from botoflow.workers.multiprocessing_activity_executor import MultiprocessingActivityExecutor
+from botoflow.workers.multiprocessing_executor import SharedTaskCounter
+
+
+@pytest.fixture
+def worker():
+    with patch.object(BaseWorker, '_fix_endpoint'), \
+            patch.object(ActivityWorker, '_register_activities'):
+        worker = ActivityWorker(Session(), 'us-east-1', 'domain', 'task_list')
+    return worker
+
+
+def empty_poll():
+    time.sleep(0.1)
+
+
+def test_shared_task_counter():
+    counter = SharedTaskCounter()
+    with counter:
+        with counter:
+            assert counter.value == 2
+    assert counter.value == 0
+
+
+def test_shared_task_counter_pickles_detached():
+    counter = pickle.loads(pickle.dumps(SharedTaskCounter()))
+    assert counter.shared_value is None
+
+
+def test_activity_executor_invalid_counts(worker):
+    executor = MultiprocessingActivityExecutor(worker)
+    with pytest.raises(ValueError):
+        executor.start(pollers=0)
+    with pytest.raises(ValueError):
+        executor.start(pollers=2, workers=1)
+
+
+def test_activity_executor_start_stop(worker):
+    worker.poll_for_activity_task = empty_poll
+    executor = MultiprocessingActivityExecutor(worker)
+    executor.start(pollers=2, workers=2)
+    try:
+        assert executor.is_running
+        assert all(process.is_alive() for process in executor._processes)
+    finally:
+        executor.stop()
+        executor.join()
+
+    assert not executor.is_running
+    assert not any(process.is_alive() for process in executor._processes)
+
+
+def test_activity_executor_drain(worker):
+    worker.poll_for_activity_task = empty_poll
+    executor = MultiprocessingActivityExecutor(worker)
+    executor.start(pollers=1, workers=1)
+    assert executor.drain(timeout=5)
+    executor.join()
@@ -0,0 +1,66 @@
+import os
+import threading
+
+from mock import MagicMock, patch
+from botocore.session import Session
+
+from botoflow import activities, activity, get_context
+from botoflow.data_converter import JSONDataConverter
+from botoflow.workers.activity_worker import ActivityWorker
+from botoflow.workers.base_worker import BaseWorker
+from botoflow.workers.process_pool_activity_executor import ProcessPoolActivityExecutor
+
+
+@activities(schedule_to_start_timeout=60,
+            start_to_close_timeout=60)
+class ProcessActivities(object):
+
+    @activity(version='1.0')
+    def getpid(self):
+        get_context().heartbeat('beat')
+        return os.getpid()
+
+
+def make_task_dict(task_id):
+    return {'activityId': task_id,
+            'activityType': {'name': 'ProcessActivities.getpid', 'version': '1.0'},
+            'input': JSONDataConverter().dumps([[], {}]),
+            'startedEventId': 1,
+            'taskToken': 'token-%s' % task_id,
+            'workflowExecution': {'workflowId': 'wfid', 'runId': 'runid'}}
+
+
+@patch.object(BaseWorker, '_fix_endpoint')
+@patch.object(ActivityWorker, '_register_activities')
+def test_warm_worker_processes(m_register, m_fix_endpoint):
+    worker = ActivityWorker(Session(), 'us-east-1', 'domain', 'task-list', ProcessActivities())
+    worker._client = client = MagicMock()
+    client.record_activity_task_heartbeat.return_value = {'cancelRequested': False}
+
+    tasks = [make_task_dict(str(i)) for i in range(6)]
+    lock = threading.Lock()
+
+    executor = ProcessPoolActivityExecutor(worker)
+    executor._shutdown_check_interval = 0.01
+
+    def poll_for_activity_task(**kwargs):
+        with lock:
+            if tasks:
+                return tasks.pop(0)
+        executor.stop()
+        return {'startedEventId': 0}
+
+    client.poll_for_activity_task.side_effect = poll_for_activity_task
+
+    executor.start(pollers=1, workers=2)
+    executor.join()
+
+    results = [call[2]['result'] for call in client.respond_activity_task_completed.mock_calls]
+    assert len(results) == 6
+    pids = set(int(result) for result in results)
+    # the processes are reused and the activities do not run in the parent
+    assert 1 <= len(pids) <= 2
+    assert os.getpid() not in pids
+
+    assert client.record_activity_task_heartbeat.call_count == 6
+    assert client.record_activity_task_heartbeat.call_args[1]['details'] == 'beat'
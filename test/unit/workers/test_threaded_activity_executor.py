@@ -0,0 +1,161 @@
+import time
+import threading
+
+import pytest
+from mock import MagicMock
+
+from botoflow.workers.prefetch import PrefetchPolicy
+from botoflow.workers.threaded_activity_executor import ThreadedActivityExecutor
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition():
+        if time.time() > deadline:
+            raise AssertionError("Timed out waiting for condition")
+        time.sleep(0.01)
+
+
+def test_pollers_pause_when_queue_full():
+    release = threading.Event()
+    processed = []
+
+    worker = MagicMock()
+    worker.poll_for_activity_task.side_effect = lambda: object()
+    worker.process_activity_task.side_effect = lambda task: (release.wait(5), processed.append(task))
+
+    executor = ThreadedActivityExecutor(worker)
+    executor._shutdown_check_interval = 0.01
+    executor.start(pollers=2, workers=1, queue_size=1)
+
+    # one task is being processed, one waits in the queue, the pollers wait for room
+    wait_for(lambda: executor.stats()['busy_workers'] == 1 and executor.stats()['queue_depth'] == 1)
+    time.sleep(0.05)
+    stats = executor.stats()
+    assert stats['tasks_polled'] == 2
+    assert stats['worker_utilization'] == 1.0
+
+    executor.stop()
+    release.set()
+    executor.join()
+
+    stats = executor.stats()
+    assert stats['queue_depth'] == 0
+    assert stats['busy_workers'] == 0
+    assert stats['tasks_processed'] == stats['tasks_polled'] == len(processed)
+
+
+def test_empty_polls_and_errors():
+    executor = ThreadedActivityExecutor(MagicMock())
+    polls = []
+
+    def poll_for_activity_task():
+        polls.append(1)
+        if len(polls) == 1:
+            raise RuntimeError("poll failed")
+        if len(polls) > 3:
+            executor.stop()
+        return None
+
+    executor._worker.poll_for_activity_task.side_effect = poll_for_activity_task
+    executor._shutdown_check_interval = 0.01
+    executor.start(pollers=1, workers=2)
+    executor.join()
+
+    assert executor._worker.unhandled_exception_handler.call_count == 1
+    assert not executor._worker.process_activity_task.called
+    assert executor.stats()['tasks_polled'] == 0
+
+
+def test_invalid_start_args():
+    executor = ThreadedActivityExecutor(MagicMock())
+    with pytest.raises(ValueError):
+        executor.start(pollers=0)
+    with pytest.raises(ValueError):
+        executor.start(workers=0)
+    with pytest.raises(ValueError):
+        executor.start(queue_size=0)
+
+
+def test_drain_abandons_polls_in_progress():
+    stuck = threading.Event()
+    finish = threading.Event()
+    polls = []
+
+    def poll_for_activity_task():
+        polls.append(1)
+        if len(polls) == 1:
+            return object()
+        stuck.wait(10)  # a long poll that won't return in time
+
+    worker = MagicMock()
+    worker.poll_for_activity_task.side_effect = poll_for_activity_task
+    worker.process_activity_task.side_effect = lambda task: finish.wait(5)
+
+    executor = ThreadedActivityExecutor(worker)
+    executor._drain_check_interval = 0.01
+    executor.start(pollers=1, workers=1)
+    wait_for(lambda: executor.stats()['busy_workers'] == 1)
+
+    assert not executor.drain(timeout=0.05)
+
+    finish.set()
+    started = time.time()
+    assert executor.drain(timeout=5)
+    assert time.time() - started < 1
+    assert executor.stats()['tasks_processed'] == 1
+    stuck.set()
+
+
+def test_prefetch_policy_buffer_size():
+    policy = PrefetchPolicy(max_buffer=10, timeout_ratio=0.5)
+    assert policy.buffer_size(0, 1.0) == 1
+    # 100 tasks/s and polls taking 50ms
+    assert policy.buffer_size(100, 0.05) == 5
+    assert policy.buffer_size(1000, 0.05) == 10
+    # the tasks may wait only 20ms in the buffer
+    assert policy.buffer_size(100, 0.05, max_wait=0.02) == 2
+    assert policy.max_wait(MagicMock(start_to_close_timeout='60')) == 30
+    assert policy.max_wait(MagicMock(start_to_close_timeout='NONE')) is None
+
+
+def test_prefetch_polls_one_task_ahead_initially():
+    release = threading.Event()
+    worker = MagicMock()
+    worker.poll_for_activity_task.side_effect = lambda: release.wait(5) and None
+
+    executor = ThreadedActivityExecutor(worker)
+    executor._shutdown_check_interval = 0.01
+    executor.start(pollers=3, workers=1, prefetch=PrefetchPolicy(max_buffer=5))
+
+    # nothing was processed yet, so there's no rate to size the buffer by
+    time.sleep(0.1)
+    assert worker.poll_for_activity_task.call_count == 1
+    assert executor.stats()['buffer_size'] == 1
+
+    executor.stop()
+    release.set()
+    executor.join()
+
+
+def test_prefetch_drops_expired_tasks():
+    slow, short = MagicMock(name='slow'), MagicMock(name='short')
+    tasks = [slow, short]
+    processed = []
+
+    worker = MagicMock()
+    worker.poll_for_activity_task.side_effect = lambda: tasks.pop(0) if tasks else None
+    worker.get_activity.side_effect = lambda task: (
+        None, MagicMock(start_to_close_timeout='60' if task is slow else '0.05'))
+    worker.process_activity_task.side_effect = lambda task: (time.sleep(0.2), processed.append(task))
+
+    executor = ThreadedActivityExecutor(worker)
+    executor._shutdown_check_interval = 0.01
+    executor.start(pollers=1, workers=1, prefetch=PrefetchPolicy(max_buffer=2))
+
+    wait_for(lambda: executor.stats()['tasks_processed'] == 2)
+    executor.stop()
+    executor.join()
+
+    assert processed == [slow]
+    assert executor.stats()['expired_tasks'] == 1
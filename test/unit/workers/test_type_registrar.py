@@ -0,0 +1,111 @@
+import json
+import os
+import time
+
+import pytest
+from botocore.exceptions import ClientError
+from mock import MagicMock, patch
+
+from botoflow.flow_types import ActivityType
+from botoflow.swf_exceptions import ThrottlingException
+from botoflow.workers.type_registrar import TypeRegistrar
+
+
+def throttled():
+    return ClientError({'Error': {'Code': 'ThrottlingException', 'Message': 'Rate exceeded'}},
+                       'RegisterActivityType')
+
+
+def activity_type(name, version='1.0', skip_registration=False):
+    return ActivityType(version, name=name, schedule_to_start_timeout=60,
+                        start_to_close_timeout=60, skip_registration=skip_registration)
+
+
+def type_infos(*names):
+    return [{'activityType': {'name': name, 'version': '1.0'}} for name in names]
+
+
+@pytest.fixture
+def client():
+    client = MagicMock()
+    client.meta.region_name = 'us-east-1'
+    client.list_activity_types.return_value = {'typeInfos': []}
+    return client
+
+
+@pytest.fixture
+def registrar(client):
+    registrar = TypeRegistrar(client, 'domain', 'task_list')
+    registrar.retry_delay = 0
+    return registrar
+
+
+def registered_names(client):
+    return sorted(call[1]['name'] for call in client.register_activity_type.call_args_list)
+
+
+def test_paginated_listing(client, registrar):
+    client.list_activity_types.side_effect = [
+        {'typeInfos': type_infos('a'), 'nextPageToken': 'token'},
+        {'typeInfos': type_infos('b')}]
+
+    registrar.register_activity_types([activity_type('a'), activity_type('b'),
+                                       activity_type('c'), activity_type('d', skip_registration=True)])
+
+    assert client.list_activity_types.call_count == 2
+    assert client.list_activity_types.call_args[1]['nextPageToken'] == 'token'
+    assert registered_names(client) == ['c']
+
+
+def test_concurrent_registration(client, registrar):
+    registrar.register_activity_types([activity_type('act%d' % i) for i in range(20)])
+    assert registered_names(client) == sorted('act%d' % i for i in range(20))
+
+
+def test_throttled_registration_retried(client, registrar):
+    client.register_activity_type.side_effect = [throttled(), throttled(), None]
+
+    registrar.register_activity_types([activity_type('a')])
+    assert client.register_activity_type.call_count == 3
+
+
+def test_throttled_registration_gives_up(client, registrar):
+    client.register_activity_type.side_effect = throttled()
+    registrar.max_retries = 2
+
+    with pytest.raises(ThrottlingException):
+        registrar.register_activity_types([activity_type('a')])
+    assert client.register_activity_type.call_count == 3
+
+
+def test_cache(tmpdir, client, registrar):
+    registrar.cache_dir = str(tmpdir)
+    client.list_activity_types.return_value = {'typeInfos': type_infos('a')}
+
+    registrar.register_activity_types([activity_type('a'), activity_type('b')])
+    assert client.list_activity_types.call_count == 1
+    assert registered_names(client) == ['b']
+
+    # warm restart
+    registrar.register_activity_types([activity_type('a'), activity_type('b')])
+    assert client.list_activity_types.call_count == 1
+    assert client.register_activity_type.call_count == 1
+
+    # a new type needs a listing again
+    registrar.register_activity_types([activity_type('a'), activity_type('c')])
+    assert client.list_activity_types.call_count == 2
+    assert registered_names(client) == ['b', 'c']
+
+
+def test_expired_cache(tmpdir, client, registrar):
+    registrar.cache_dir = str(tmpdir)
+    registrar.register_activity_types([activity_type('a')])
+
+    cache_file, = tmpdir.listdir()
+    with open(str(cache_file)) as f:
+        cache = json.load(f)
+    assert cache['types'] == [['a', '1.0']]
+
+    with patch('botoflow.workers.type_registrar.time.time', return_value=time.time() + 3601):
+        registrar.register_activity_types([activity_type('a')])
+    assert client.list_activity_types.call_count == 2